@@ -26,11 +26,14 @@ import geopandas as gpd
 import os
 import folium
 import numpy as np
-import json
+import shapely
 from shapely.geometry import Point
 from streamlit_folium import st_folium
 from src.analysis.site_summary import summarize_site
-from src.visualization.optimal_zones_viz import render_optimal_zones_map
+from src.utils.vector_cache import read_file_cached
+from src.visualization.optimal_zones_viz import (
+    render_optimal_zones_map, safe_point_coords, substations_layer, transmission_lines_geojson
+)
 
 # ======================================================
 # 🌍 STREAMLIT CONFIG
@@ -108,21 +111,17 @@ WIND_PATH  = os.path.join(PROJECT_ROOT, "data", "wind_farms", "Wind Farms June 2
 # ======================================================
 # 📘 HELPERS
 # ======================================================
+@st.cache_data(show_spinner=False, max_entries=8)
+def read_layer(path, mtime):
+    """Read a layer in EPSG:4326 once per file version (`mtime` keys the cache)."""
+    gdf = read_file_cached(path, crs="EPSG:4326")
+    return gdf[gdf.geometry.notnull()].copy()
+
 def load_layer(path):
     if not os.path.exists(path):
         st.warning(f"⚠️ Missing file: {path}")
         return gpd.GeoDataFrame()
-    gdf = gpd.read_file(path)
-    if gdf.crs and gdf.crs.to_string() != "EPSG:4326":
-        gdf = gdf.to_crs("EPSG:4326")
-    return gdf[gdf.geometry.notnull()].copy()
-
-def safe_point_coords(g):
-    if g is None or g.is_empty:
-        return None
-    if g.geom_type == "Point":
-        return [g.y, g.x]
-    return [g.centroid.y, g.centroid.x]
+    return read_layer(path, os.path.getmtime(path))
 
 # ======================================================
 # 🧭 LOAD DATA
@@ -131,8 +130,18 @@ lines = load_layer(LINES_PATH)
 subs  = load_layer(SUBS_PATH)
 wind  = load_layer(WIND_PATH)
 
-subs["coords"] = subs.geometry.apply(safe_point_coords)
-wind["coords"] = wind.geometry.apply(safe_point_coords)
+def has_location(gdf):
+    """Mask of features with a usable (present, non-empty) geometry."""
+    geoms = gdf.geometry.values
+    return ~(shapely.is_missing(geoms) | shapely.is_empty(geoms))
+
+# Drop features without a location once, then take [lat, lon] per feature
+# in one vectorized pass (centroid for non-points)
+subs = subs[has_location(subs)].reset_index(drop=True)
+wind = wind[has_location(wind)].reset_index(drop=True)
+sub_coords = safe_point_coords(subs.geometry)
+subs["coords"] = sub_coords.tolist()
+wind["coords"] = safe_point_coords(wind.geometry).tolist()
 
 # ======================================================
 # 🗺️ BUILD FOLIUM MAP
@@ -140,24 +149,18 @@ wind["coords"] = wind.geometry.apply(safe_point_coords)
 m = folium.Map(location=[53.5, -8], zoom_start=7, tiles="CartoDB positron")
 
 # Transmission lines
-for col in lines.select_dtypes(include=["datetime64[ns]"]).columns:
-    lines[col] = lines[col].astype(str)
-lines_geojson = json.loads(lines[["geometry"]].to_json())
 folium.GeoJson(
-    lines_geojson,
+    transmission_lines_geojson(lines),
     name="Transmission Lines",
     style_function=lambda x: {"color": "#007BFF", "weight": 2, "opacity": 0.7},
 ).add_to(m)
 
 # Substations (red)
-for _, row in subs.iterrows():
-    if row["coords"]:
-        folium.CircleMarker(location=row["coords"], radius=3, color="#D7263D", fill=True).add_to(m)
+substations_layer(sub_coords).add_to(m)
 
 # Wind farms (green)
-for _, row in wind.iterrows():
-    if row["coords"]:
-        folium.CircleMarker(location=row["coords"], radius=4, color="#009E73", fill=True).add_to(m)
+for row in wind[["coords"]].itertuples(index=False):
+    folium.CircleMarker(location=row.coords, radius=4, color="#009E73", fill=True).add_to(m)
 
 # ======================================================
 # 🌈 ADD MAP LEGEND (now inside the map)
@@ -0,0 +1,99 @@
+# ============================================================
+# 🚀 AI-ASSISTED CODE NOTICE
+# This file was developed with assistance from OpenAI's ChatGPT (GPT-5)
+# as part of the NASA Space Apps 2025 project:
+# “TerraWatt — Will It Rain on My Parade?”
+# ============================================================
+
+"""
+onshore_offshore.py
+-------------------
+Offline onshore/offshore classification for whole arrays of points, used
+to label the optimal-zones analysis grid in one call before scoring.
+
+A local land polygon (see src/processing/build_ireland_land.py) gives an
+exact point-in-polygon test; without it the simple bounding-box rule is used.
+"""
+
+import os
+from functools import lru_cache
+import numpy as np
+import shapely
+from src.utils.vector_cache import read_file_cached
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+# Land polygon(s) for the offline onshore/offshore test, e.g. Natural Earth
+# land clipped to Ireland. Any vector format works; a GeoParquet copy is
+# cached next to it.
+LAND_POLYGON_PATH = os.path.join(PROJECT_ROOT, "data", "coastline", "ireland_land.geojson")
+
+
+@lru_cache(maxsize=1)
+def _land():
+    """Dissolved, prepared land geometry (None if no land file is available)."""
+    if not os.path.exists(LAND_POLYGON_PATH):
+        return None
+    land = shapely.union_all(read_file_cached(LAND_POLYGON_PATH, crs="EPSG:4326").geometry.values)
+    shapely.prepare(land)
+    return land
+
+
+def classify_onshore_offshore(lats, lons):
+    """
+    Vectorized point-in-polygon onshore/offshore labels for whole arrays.
+    Returns None when no local land polygon is available.
+    """
+    land = _land()
+    if land is None:
+        return None
+    onshore = shapely.contains_xy(land, np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+    return np.where(onshore, 'Onshore', 'Offshore')
+
+
+def determine_onshore_offshore_simple_batch(lats, lons):
+    """
+    Simple onshore/offshore rule for whole arrays of points: the same
+    decision tree as determine_onshore_offshore_simple, as NumPy masks.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+
+    # Ireland's approximate boundaries (simplified)
+    in_bounds = (lats >= 51.0) & (lats <= 55.5) & (lons >= -11.0) & (lons <= -5.0)
+
+    # West of -8.5° longitude - more likely offshore, east of -6.5° - more
+    # likely onshore, central areas use latitude as proxy
+    west = lons < -8.5
+    east = lons > -6.5
+    offshore = np.select(
+        [west, east],
+        [(lats < 52.5) | (lats > 54.5), (lats < 51.5) | (lats > 55.0)],
+        default=(lats < 52.0) | (lats > 55.0)
+    )
+    return np.where(in_bounds & ~offshore, 'Onshore', 'Offshore')
+
+
+def determine_onshore_offshore_simple(lat, lon):
+    """Simple fallback method for onshore/offshore determination."""
+    try:
+        return str(determine_onshore_offshore_simple_batch([lat], [lon])[0])
+    except Exception:
+        # Final fallback: use simple distance from center
+        center_lat, center_lon = 53.5, -8.0
+        distance = ((lat - center_lat)**2 + (lon - center_lon)**2)**0.5
+
+        if distance > 2.0:  # More than 2 degrees from center
+            return 'Offshore'
+        else:
+            return 'Onshore'
+
+
+def classify_grid_points(grid_points):
+    """Onshore/offshore label for every grid point dict, in one call."""
+    lats = [p['latitude'] for p in grid_points]
+    lons = [p['longitude'] for p in grid_points]
+    labels = classify_onshore_offshore(lats, lons)
+    if labels is None:
+        labels = determine_onshore_offshore_simple_batch(lats, lons)
+    return labels.tolist()
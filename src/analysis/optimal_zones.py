@@ -36,6 +36,7 @@ import geopandas as gpd
 import rasterio
 from shapely.geometry import Point, Polygon
 from scipy.spatial.distance import cdist
+from src.analysis.onshore_offshore import classify_grid_points
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -312,101 +313,6 @@ def calculate_optimal_zones(
     print("🌱 Loading existing wind farms...")
     existing_wind_farms = load_existing_wind_farms()
     
-    # Auto-detection function for wind farm type using OpenStreetMap
-    def determine_onshore_offshore_osm(lat, lon):
-        """Determine if a location is onshore or offshore using OpenStreetMap data."""
-        try:
-            import requests
-            import json
-            
-            # Use Overpass API to query OpenStreetMap for land/water information
-            overpass_url = "http://overpass-api.de/api/interpreter"
-            
-            # Create a small bounding box around the point (±0.01 degrees ≈ 1km)
-            bbox = f"{lat-0.01},{lon-0.01},{lat+0.01},{lon+0.01}"
-            
-            # Query for water bodies (oceans, seas, lakes, rivers)
-            water_query = f"""
-            [out:json][timeout:25];
-            (
-              way["natural"="water"]({bbox});
-              way["waterway"]({bbox});
-              relation["natural"="water"]({bbox});
-              relation["waterway"]({bbox});
-            );
-            out geom;
-            """
-            
-            # Check for water bodies
-            water_response = requests.get(overpass_url, params={'data': water_query}, timeout=10)
-            if water_response.status_code == 200:
-                water_data = water_response.json()
-                if water_data.get('elements'):
-                    return 'Offshore'  # Found water bodies
-            
-            # If no water found, assume onshore
-            return 'Onshore'
-            
-        except Exception as e:
-            # Fallback to simple method if OSM query fails
-            return determine_onshore_offshore_simple(lat, lon)
-    
-    def determine_onshore_offshore_simple(lat, lon):
-        """Simple fallback method for onshore/offshore determination."""
-        try:
-            # Ireland's approximate boundaries (simplified)
-            ireland_bounds = {
-                'lat_min': 51.0,
-                'lat_max': 55.5,
-                'lon_min': -11.0,
-                'lon_max': -5.0
-            }
-            
-            # Check if coordinates are within Ireland bounds
-            if not (ireland_bounds['lat_min'] <= lat <= ireland_bounds['lat_max'] and 
-                    ireland_bounds['lon_min'] <= lon <= ireland_bounds['lon_max']):
-                return 'Offshore'  # Outside Ireland bounds
-            
-            # Simplified onshore/offshore determination based on distance from coast
-            # Ireland's approximate coastline characteristics
-            # West coast (more exposed to Atlantic)
-            if lon < -8.5:
-                # West of -8.5° longitude - more likely offshore
-                if lat < 52.5 or lat > 54.5:
-                    return 'Offshore'
-                else:
-                    return 'Onshore'
-            
-            # East coast (more sheltered)
-            elif lon > -6.5:
-                # East of -6.5° longitude - more likely onshore
-                if lat < 51.5 or lat > 55.0:
-                    return 'Offshore'
-                else:
-                    return 'Onshore'
-            
-            # Central areas - use latitude as proxy
-            else:
-                if lat < 52.0 or lat > 55.0:
-                    return 'Offshore'
-                else:
-                    return 'Onshore'
-                    
-        except Exception as e:
-            # Final fallback: use simple distance from center
-            center_lat, center_lon = 53.5, -8.0
-            distance = ((lat - center_lat)**2 + (lon - center_lon)**2)**0.5
-            
-            if distance > 2.0:  # More than 2 degrees from center
-                return 'Offshore'
-            else:
-                return 'Onshore'
-    
-    def determine_onshore_offshore(lat, lon):
-        """Determine if a location is onshore or offshore based on coordinates."""
-        # Use simple method for faster processing (OSM API is too slow)
-        return determine_onshore_offshore_simple(lat, lon)
-    
     # Create analysis grid
     print("📊 Creating analysis grid...")
     lat_min, lat_max = 51.0, 55.5
@@ -426,6 +332,10 @@ def calculate_optimal_zones(
     
     print(f"🔍 Analyzing {len(grid_points)} grid points...")
     
+    # Auto-detect: classify every grid point once, up front
+    if wind_farm_type == "Auto-Detect":
+        location_types = classify_grid_points(grid_points)
+    
     # Calculate scores for each point
     results = []
     for i, point in enumerate(grid_points):
@@ -441,8 +351,8 @@ def calculate_optimal_zones(
         variability_score = calculate_wind_variability_score(lat, lon, wind_data)
         # Adjust scoring based on wind farm type
         if wind_farm_type == "Auto-Detect":
-            # Auto-detect: determine type for this location
-            location_type = determine_onshore_offshore(lat, lon)
+            # Auto-detect: type for this location
+            location_type = location_types[i]
             if location_type == "Offshore":
                 grid_score = calculate_offshore_grid_score(lat, lon, subs, lines)
                 env_score = calculate_offshore_environmental_score(lat, lon, existing_wind_farms)
@@ -490,7 +400,7 @@ def calculate_optimal_zones(
         
         # Determine location type for auto-detection
         if wind_farm_type == "Auto-Detect":
-            location_type = determine_onshore_offshore(lat, lon)
+            location_type = location_types[i]
         else:
             location_type = wind_farm_type
             
@@ -665,101 +575,6 @@ def calculate_optimal_zones_with_progress(
     
     existing_wind_farms = load_existing_wind_farms()
     
-    # Auto-detection function for wind farm type using OpenStreetMap
-    def determine_onshore_offshore_osm(lat, lon):
-        """Determine if a location is onshore or offshore using OpenStreetMap data."""
-        try:
-            import requests
-            import json
-            
-            # Use Overpass API to query OpenStreetMap for land/water information
-            overpass_url = "http://overpass-api.de/api/interpreter"
-            
-            # Create a small bounding box around the point (±0.01 degrees ≈ 1km)
-            bbox = f"{lat-0.01},{lon-0.01},{lat+0.01},{lon+0.01}"
-            
-            # Query for water bodies (oceans, seas, lakes, rivers)
-            water_query = f"""
-            [out:json][timeout:25];
-            (
-              way["natural"="water"]({bbox});
-              way["waterway"]({bbox});
-              relation["natural"="water"]({bbox});
-              relation["waterway"]({bbox});
-            );
-            out geom;
-            """
-            
-            # Check for water bodies
-            water_response = requests.get(overpass_url, params={'data': water_query}, timeout=10)
-            if water_response.status_code == 200:
-                water_data = water_response.json()
-                if water_data.get('elements'):
-                    return 'Offshore'  # Found water bodies
-            
-            # If no water found, assume onshore
-            return 'Onshore'
-            
-        except Exception as e:
-            # Fallback to simple method if OSM query fails
-            return determine_onshore_offshore_simple(lat, lon)
-    
-    def determine_onshore_offshore_simple(lat, lon):
-        """Simple fallback method for onshore/offshore determination."""
-        try:
-            # Ireland's approximate boundaries (simplified)
-            ireland_bounds = {
-                'lat_min': 51.0,
-                'lat_max': 55.5,
-                'lon_min': -11.0,
-                'lon_max': -5.0
-            }
-            
-            # Check if coordinates are within Ireland bounds
-            if not (ireland_bounds['lat_min'] <= lat <= ireland_bounds['lat_max'] and 
-                    ireland_bounds['lon_min'] <= lon <= ireland_bounds['lon_max']):
-                return 'Offshore'  # Outside Ireland bounds
-            
-            # Simplified onshore/offshore determination based on distance from coast
-            # Ireland's approximate coastline characteristics
-            # West coast (more exposed to Atlantic)
-            if lon < -8.5:
-                # West of -8.5° longitude - more likely offshore
-                if lat < 52.5 or lat > 54.5:
-                    return 'Offshore'
-                else:
-                    return 'Onshore'
-            
-            # East coast (more sheltered)
-            elif lon > -6.5:
-                # East of -6.5° longitude - more likely onshore
-                if lat < 51.5 or lat > 55.0:
-                    return 'Offshore'
-                else:
-                    return 'Onshore'
-            
-            # Central areas - use latitude as proxy
-            else:
-                if lat < 52.0 or lat > 55.0:
-                    return 'Offshore'
-                else:
-                    return 'Onshore'
-                    
-        except Exception as e:
-            # Final fallback: use simple distance from center
-            center_lat, center_lon = 53.5, -8.0
-            distance = ((lat - center_lat)**2 + (lon - center_lon)**2)**0.5
-            
-            if distance > 2.0:  # More than 2 degrees from center
-                return 'Offshore'
-            else:
-                return 'Onshore'
-    
-    def determine_onshore_offshore(lat, lon):
-        """Determine if a location is onshore or offshore based on coordinates."""
-        # Use simple method for faster processing (OSM API is too slow)
-        return determine_onshore_offshore_simple(lat, lon)
-    
     if progress_callback:
         progress_callback(0.20, "Creating analysis grid...")
     
@@ -806,6 +621,10 @@ def calculate_optimal_zones_with_progress(
     total_points = len(grid_points)
     results = []
     
+    # Auto-detect: classify every grid point once, up front
+    if wind_farm_type == "Auto-Detect":
+        location_types = classify_grid_points(grid_points)
+    
     if progress_callback:
         progress_callback(0.25, f"Analyzing {total_points} grid points...")
     
@@ -833,8 +652,8 @@ def calculate_optimal_zones_with_progress(
         variability_score = calculate_wind_variability_score(lat, lon, wind_data)
         # Adjust scoring based on wind farm type
         if wind_farm_type == "Auto-Detect":
-            # Auto-detect: determine type for this location
-            location_type = determine_onshore_offshore(lat, lon)
+            # Auto-detect: type for this location
+            location_type = location_types[i]
             if location_type == "Offshore":
                 grid_score = calculate_offshore_grid_score(lat, lon, subs, lines)
                 env_score = calculate_offshore_environmental_score(lat, lon, existing_wind_farms)
@@ -886,7 +705,7 @@ def calculate_optimal_zones_with_progress(
         
         # Determine location type for auto-detection
         if wind_farm_type == "Auto-Detect":
-            location_type = determine_onshore_offshore(lat, lon)
+            location_type = location_types[i]
         else:
             location_type = wind_farm_type
             
@@ -32,6 +32,10 @@ import xarray as xr
 import pandas as pd
 import numpy as np
 import os
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
@@ -62,6 +66,41 @@ SOLAR_VARS = [
 # Combined variables for comprehensive analysis
 ALL_VARS = WIND_VARS + SOLAR_VARS
 
+# ERA5 native grid spacing (degrees)
+NATIVE_RESOLUTION = 0.25
+
+# Resampling target grids, keyed by (lat_min, lat_max, lon_min, lon_max, resolution)
+_TARGET_GRID = {}
+
+# Planetary Computer signing
+SIGN_WORKERS = 16
+SIGN_TTL_S = 30 * 60  # SAS tokens are valid for longer; re-sign well before expiry
+
+@lru_cache(maxsize=1024)
+def _sign_href(href, ttl_bucket):
+    """Sign a single asset HREF. `ttl_bucket` rolls over every SIGN_TTL_S seconds."""
+    return pc.sign(href)
+
+def _get_target_grid(lat_min, lat_max, lon_min, lon_max, resolution):
+    """Return (cached) lat/lon DataArrays for resampling to `resolution`."""
+    key = (lat_min, lat_max, lon_min, lon_max, resolution)
+    if key not in _TARGET_GRID:
+        lat_vals = np.arange(lat_min, lat_max + resolution, resolution)
+        lon_vals = np.arange(lon_min, lon_max + resolution, resolution)
+        _TARGET_GRID[key] = (
+            xr.DataArray(lat_vals, dims="lat"),
+            xr.DataArray(lon_vals, dims="lon"),
+        )
+    return _TARGET_GRID[key]
+
+def _sign_hrefs(hrefs):
+    """Sign many asset HREFs concurrently, reusing cached signatures."""
+    bucket = int(time.time() // SIGN_TTL_S)
+    unique = list(dict.fromkeys(hrefs))
+    with ThreadPoolExecutor(max_workers=SIGN_WORKERS) as pool:
+        signed = pool.map(lambda h: _sign_href(h, bucket), unique)
+        return dict(zip(unique, signed))
+
 # ============================================================
 # ENHANCED ERA5 DATA FETCHER
 # ============================================================
@@ -87,7 +126,7 @@ def fetch_era5_data_with_solar(
     variables : list, optional
         List of variables to fetch. If None, fetches all wind and solar variables.
     resolution : float, optional
-        Grid resolution in degrees (default: 0.25)
+        Grid resolution in degrees (default: 0.25, ERA5 native - no resampling)
     output_prefix : str, optional
         Prefix for output files
     debug : bool, optional
@@ -122,14 +161,16 @@ def fetch_era5_data_with_solar(
     
     print(f"📡 Found {len(items)} ERA5 items")
     
-    # Sign items for access
-    signed_items = [pc.sign(item) for item in items]
+    # Sign the required asset HREFs for access (in parallel, cached)
+    signed_hrefs = _sign_hrefs(
+        [item.assets[var].href for item in items for var in variables if var in item.assets]
+    )
     
     # Process each item
     datasets = []
-    for i, item in enumerate(signed_items):
+    for i, item in enumerate(items):
         if debug:
-            print(f"Processing item {i+1}/{len(signed_items)}")
+            print(f"Processing item {i+1}/{len(items)}")
         
         item_datasets = []
         for var in variables:
@@ -137,7 +178,8 @@ def fetch_era5_data_with_solar(
                 asset = item.assets[var]
                 try:
                     ds_var = xr.open_dataset(
-                        asset.href, 
+                        signed_hrefs[asset.href], 
+                        chunks={"time": -1},  # lazy: defer reads until export
                         **asset.extra_fields.get("xarray:open_kwargs", {})
                     )
                     item_datasets.append(ds_var)
@@ -160,7 +202,13 @@ def fetch_era5_data_with_solar(
     
     # Combine all time steps
     print("🔄 Combining time steps...")
-    ds_combined = xr.concat(datasets, dim="time")
+    ds_combined = xr.combine_by_coords(
+        datasets,
+        data_vars="minimal",
+        coords="minimal",
+        compat="override",
+        combine_attrs="drop_conflicts"
+    )
     
     # Convert longitude bounds if needed
     if lon_min < 0:
@@ -223,23 +271,17 @@ def fetch_era5_data_with_solar(
         # Assume 20% efficiency for solar panels
         ds_clipped["solar_capacity_factor"] = (ds_clipped["solar_irradiance"] / 1000 * 0.20).clip(0, 1)
     
-    # Resample to uniform grid if needed
-    if resolution != 0.25:  # ERA5 native resolution
+    # Resample to uniform grid if needed (skipped entirely at native resolution)
+    if not math.isclose(resolution, NATIVE_RESOLUTION):
         print(f"📐 Resampling to {resolution}° resolution...")
-        lat_vals = np.arange(
-            float(ds_clipped.lat.min()), 
-            float(ds_clipped.lat.max()) + resolution, 
-            resolution
-        )
-        lon_vals = np.arange(
-            float(ds_clipped.lon.min()), 
-            float(ds_clipped.lon.max()) + resolution, 
+        new_lat, new_lon = _get_target_grid(
+            float(ds_clipped.lat.min()),
+            float(ds_clipped.lat.max()),
+            float(ds_clipped.lon.min()),
+            float(ds_clipped.lon.max()),
             resolution
         )
         
-        new_lat = xr.DataArray(lat_vals, dims="lat")
-        new_lon = xr.DataArray(lon_vals, dims="lon")
-        
         ds_clipped = ds_clipped.interp(lat=new_lat, lon=new_lon, method="linear")
     
     # Convert longitudes back to [-180, 180]
@@ -269,7 +311,8 @@ def fetch_era5_data_with_solar(
             
             # Convert longitudes
             if "lon" in df_var.columns:
-                df_var["lon"] = df_var["lon"].apply(lambda x: x - 360 if x > 180 else x)
+                lon = df_var["lon"].to_numpy()
+                df_var["lon"] = lon - 360.0 * (lon > 180)
             
             # Save CSV
             csv_path = os.path.join(OUT_DIR, f"{output_prefix}_{var}.csv")
@@ -360,8 +403,11 @@ def create_solar_irradiance_map(data_dict, output_path=None):
         m = folium.Map(location=[53.5, -8], zoom_start=7)
         
         # Add solar irradiance heatmap
-        heat_data = [[row['lat'], row['lon'], row['solar_irradiance']] 
-                    for _, row in df.iterrows() if not pd.isna(row['solar_irradiance'])]
+        heat_data = (
+            df.dropna(subset=['solar_irradiance'])[['lat', 'lon', 'solar_irradiance']]
+            .to_numpy(dtype=np.float64)
+            .tolist()
+        )
         
         plugins.HeatMap(
             heat_data,
@@ -5,8 +5,9 @@
 # “TerraWatt — Will It Rain on My Parade?”
 # ============================================================
 
-import geopandas as gpd
 import pandas as pd
+from src.utils.vector_cache import read_file_cached
+
 
 def load_wind_farms(shp_path="data/generators/Wind Farms June 2022_ESPG3857.shp"):
     """
@@ -21,8 +22,7 @@ def load_wind_farms(shp_path="data/generators/Wind Farms June 2022_ESPG3857.shp"
     gdf : GeoDataFrame
         Cleaned GeoDataFrame with name, capacity, and lat/lon
     """
-    gdf = gpd.read_file(shp_path)
-    gdf = gdf.to_crs("EPSG:4326")  # convert to lat/lon
+    gdf = read_file_cached(shp_path, crs="EPSG:4326")  # lat/lon, parquet-cached
 
     # Normalize column names
     gdf.columns = gdf.columns.str.lower()
@@ -23,11 +23,11 @@
 
 import os
 import pandas as pd
-import geopandas as gpd
 import requests
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from time import sleep
+from src.utils.vector_cache import read_file_cached
 
 # ======================================================
 # 🌦️ Load environment variables
@@ -70,7 +70,7 @@ def fetch_batch(coords, start, end, interval="PT1H", parameters=None):
 # 💨 Fetch all wind farms in batches
 # ======================================================
 def batch_forecast():
-    gdf = gpd.read_file(WIND_PATH).to_crs(4326)
+    gdf = read_file_cached(WIND_PATH, crs=4326)
     farms = [(row.geometry.y, row.geometry.x, row.get("Name", f"Farm_{i}")) for i, row in gdf.iterrows()]
     print(f"✅ Loaded {len(farms)} wind farms")
 
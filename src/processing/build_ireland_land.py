@@ -0,0 +1,54 @@
+# ============================================================
+# 🚀 AI-ASSISTED CODE NOTICE
+# This file was developed with assistance from OpenAI's ChatGPT (GPT-5)
+# as part of the NASA Space Apps 2025 project:
+# “TerraWatt — Will It Rain on My Parade?”
+# ============================================================
+
+"""
+build_ireland_land.py
+---------------------
+One-off data prep: downloads Natural Earth 1:10m land polygons, clips them
+to the optimal-zones analysis area around Ireland and saves the result as
+data/coastline/ireland_land.geojson, the land polygon used for the offline
+onshore/offshore classification (src/analysis/onshore_offshore.py).
+
+Run once from the project root:
+    python -m src.processing.build_ireland_land
+"""
+
+import os
+import geopandas as gpd
+import requests
+
+NATURAL_EARTH_LAND_URL = "https://naciscdn.org/naturalearth/10m/physical/ne_10m_land.zip"
+
+# Analysis grid bounds (lon_min, lat_min, lon_max, lat_max) plus a small margin
+IRELAND_BBOX = (-11.5, 50.5, -4.5, 56.0)
+
+
+def build_ireland_land(out_dir="data/coastline"):
+    os.makedirs(out_dir, exist_ok=True)
+
+    # --- Natural Earth land (downloaded once, then reused) ---
+    zip_path = os.path.join(out_dir, "ne_10m_land.zip")
+    if not os.path.exists(zip_path):
+        print("📡 Downloading Natural Earth 1:10m land polygons...")
+        response = requests.get(NATURAL_EARTH_LAND_URL, timeout=120)
+        response.raise_for_status()
+        with open(zip_path, "wb") as f:
+            f.write(response.content)
+
+    # --- Clip to the analysis area ---
+    land = gpd.read_file(zip_path, bbox=IRELAND_BBOX, engine="pyogrio")
+    land = gpd.clip(land.to_crs(4326), IRELAND_BBOX)
+    land = land[~land.geometry.is_empty][["geometry"]]
+
+    out_path = os.path.join(out_dir, "ireland_land.geojson")
+    land.to_file(out_path, driver="GeoJSON")
+    print(f"✅ Saved {len(land)} land polygons → {out_path}")
+    return out_path
+
+
+if __name__ == "__main__":
+    build_ireland_land()
@@ -6,7 +6,9 @@
 # ============================================================
 
 import os
+import numpy as np
 import geopandas as gpd
+import shapely
 import osmnx as ox
 import folium
 import requests
@@ -16,8 +18,13 @@ def extract_osm_ireland_110kv(out_dir="data/osm"):
     os.makedirs(out_dir, exist_ok=True)
     print("📡 Fetching OSM substations and 110 kV lines for Ireland...")
 
-    # --- Get the boundary / polygon for Ireland ---
-    ireland = ox.geocode_to_gdf("Ireland")
+    # --- Get the boundary / polygon for Ireland (geocoded once, then cached) ---
+    boundary_cache = os.path.join(out_dir, "ireland_boundary.parquet")
+    if os.path.exists(boundary_cache):
+        ireland = gpd.read_parquet(boundary_cache)
+    else:
+        ireland = ox.geocode_to_gdf("Ireland")
+        ireland.to_parquet(boundary_cache)
     # optionally buffer slightly if you want to include fringe lines crossing the boundary
     # ireland = ireland.to_crs(epsg=3857).buffer(5000).to_crs(epsg=4326)
     poly = ireland.geometry.unary_union
@@ -52,30 +59,24 @@ def extract_osm_ireland_110kv(out_dir="data/osm"):
         style_function=lambda x: {"color": "#0033cc", "weight": 2},
     ).add_to(m)
 
-    for _, row in sub_gdf.iterrows():
-        geom = row.geometry
-        if geom is None:
+    # Point centroids are the points themselves; non-point ways use their centroid
+    centroids = shapely.centroid(sub_gdf.geometry.to_numpy())
+    xs, ys = shapely.get_x(centroids), shapely.get_y(centroids)
+    names = (
+        sub_gdf["name"].to_numpy() if "name" in sub_gdf.columns
+        else np.full(len(sub_gdf), "Unnamed 110 kV Substation", dtype=object)
+    )
+    for x, y, name in zip(xs, ys, names):
+        if np.isnan(x) or np.isnan(y):  # missing geometry
             continue
-        if geom.geom_type == "Point":
-            folium.CircleMarker(
-                location=[geom.y, geom.x],
-                radius=4,
-                color="red",
-                fill=True,
-                fill_opacity=0.7,
-                popup=row.get("name", "Unnamed 110 kV Substation"),
-            ).add_to(m)
-        else:
-            # for non-point geometries (e.g. way center), you may use centroid
-            centroid = geom.centroid
-            folium.CircleMarker(
-                location=[centroid.y, centroid.x],
-                radius=4,
-                color="red",
-                fill=True,
-                fill_opacity=0.7,
-                popup=row.get("name", "Unnamed 110 kV Substation"),
-            ).add_to(m)
+        folium.CircleMarker(
+            location=[y, x],
+            radius=4,
+            color="red",
+            fill=True,
+            fill_opacity=0.7,
+            popup=name,
+        ).add_to(m)
 
     html_path = os.path.join(out_dir, "ireland_grid_preview.html")
     m.save(html_path)
@@ -19,6 +19,8 @@ def load_country_shapes(geojson_path: str):
     if _countries_gdf is None:
         _countries_gdf = gpd.read_file(geojson_path)
         _countries_gdf = _countries_gdf.to_crs("EPSG:4326")
+        # Build the R-tree once so point lookups don't scan every polygon
+        _countries_gdf.sindex
     return _countries_gdf
 
 
@@ -31,9 +33,9 @@ def get_country_from_point(lat: float, lon: float):
     if gdf is None:
         raise RuntimeError("Country shapes not loaded. Call load_country_shapes() first.")
     point = Point(lon, lat)
-    match = gdf[gdf.geometry.contains(point)]
-    if not match.empty:
-        row = match.iloc[0]
+    idx = gdf.sindex.query(point, predicate="within")
+    if len(idx):
+        row = gdf.iloc[idx.min()]
         return {
             "iso_a3": row.get("ADM0_A3") or row.get("ISO_A3"),
             "country_name": row.get("ADMIN") or row.get("NAME"),
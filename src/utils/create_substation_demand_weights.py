@@ -0,0 +1,127 @@
+# ============================================================
+# 🚀 AI-ASSISTED CODE NOTICE
+# This file was developed with assistance from OpenAI's ChatGPT (GPT-5)
+# as part of the NASA Space Apps 2025 project:
+# “TerraWatt — Will It Rain on My Parade?”
+# ============================================================
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+# Vectorized GEOS ufuncs (shapely.intersection / shapely.area) need Shapely 2
+if int(shapely.__version__.split(".")[0]) < 2:
+    raise ImportError(f"❌ Shapely >= 2.0 required, found {shapely.__version__}")
+
+# Optional: parallel, spatially partitioned join across cores
+try:
+    import dask_geopandas as dgpd
+except ImportError:
+    dgpd = None
+# ======================================================
+# CONFIG
+# ======================================================
+import os
+
+# Always resolve project root (2 levels up from utils/)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+SUBS_PATH = os.path.join(PROJECT_ROOT, "data", "osm", "substations_110kV_clean.geojson")
+BUILTUP_PATH = os.path.join(PROJECT_ROOT, "data", "shape", "ne_10m_urban_areas.shp")
+OUTPUT_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "substation_demand_weights.csv")
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache")
+
+TARGET_CRS = "EPSG:2157"  # Irish Transverse Mercator: true metres and m² for area math
+BUFFER_RADIUS_M = 15000  # ~15 km
+CLIP_PAD_M = 20000  # built-up polygons further than this from any substation are ignored
+N_CORES = os.cpu_count() or 1
+
+# Reprojected + prefiltered built-up polygons; rebuilt when either input is newer
+# (delete the file after changing TARGET_CRS or CLIP_PAD_M)
+BUILTUP_CACHE = os.path.join(
+    CACHE_DIR, f"builtup_{TARGET_CRS.split(':')[-1]}_clipped.parquet"
+)
+
+# ======================================================
+# LOAD DATA
+# ======================================================
+subs = gpd.read_file(SUBS_PATH).to_crs(TARGET_CRS)
+
+cache_fresh = os.path.exists(BUILTUP_CACHE) and all(
+    os.path.getmtime(BUILTUP_CACHE) >= os.path.getmtime(p) for p in (SUBS_PATH, BUILTUP_PATH)
+)
+if cache_fresh:
+    print(f"⏩ Using cached built-up polygons → {BUILTUP_CACHE}")
+    builtup = gpd.read_parquet(BUILTUP_CACHE)
+else:
+    builtup = gpd.read_file(BUILTUP_PATH).to_crs(TARGET_CRS)
+
+    # Keep only built-up polygons near a substation: cheap bounding-box
+    # prefilter first, then an STRtree distance query against the substations
+    minx, miny, maxx, maxy = subs.total_bounds
+    builtup = builtup.cx[minx - CLIP_PAD_M:maxx + CLIP_PAD_M, miny - CLIP_PAD_M:maxy + CLIP_PAD_M]
+    near = shapely.STRtree(subs.geometry.to_numpy()).query(
+        builtup.geometry.to_numpy(), predicate="dwithin", distance=CLIP_PAD_M
+    )[0]
+    builtup = builtup.iloc[np.unique(near)]
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    builtup.to_parquet(BUILTUP_CACHE)
+
+# ======================================================
+# COMPUTE BUILT-UP AREA WEIGHT PER SUBSTATION
+# ======================================================
+def candidate_pairs(buffers, builtup_geoms, crs):
+    """Return (buffer idx, built-up idx) arrays for every intersecting pair."""
+    if dgpd is None or N_CORES < 2:
+        # Bulk STRtree query over all buffers at once
+        return shapely.STRtree(builtup_geoms).query(buffers, predicate="intersects")
+
+    left = gpd.GeoDataFrame({"bu_id": np.arange(len(builtup_geoms))}, geometry=builtup_geoms, crs=crs)
+    right = gpd.GeoDataFrame(geometry=buffers, crs=crs)
+    dleft = dgpd.from_geopandas(left, npartitions=N_CORES).spatial_shuffle(by="hilbert")
+    dright = dgpd.from_geopandas(right, npartitions=1)
+    pairs = dgpd.sjoin(dleft, dright, predicate="intersects").compute()
+    return pairs["index_right"].to_numpy(), pairs["bu_id"].to_numpy()
+
+
+print("🏙️ Computing built-up area coverage around substations...")
+
+builtup_geoms = builtup.geometry.to_numpy()
+builtup_areas = shapely.area(builtup_geoms)
+buffers = subs.geometry.buffer(BUFFER_RADIUS_M).to_numpy()
+# Prepare once (in place): every later intersects/contains test against a
+# buffer reuses its indexed edge structure instead of rebuilding it
+shapely.prepare(buffers)
+
+hit_sub, hit_bu = candidate_pairs(buffers, builtup_geoms, subs.crs)
+
+# Fully contained polygons contribute their precomputed area; only the
+# partially overlapping ones need an actual intersection
+contained = shapely.contains(buffers[hit_sub], builtup_geoms[hit_bu])
+cont_sub, cont_bu = hit_sub[contained], hit_bu[contained]
+part_sub, part_bu = hit_sub[~contained], hit_bu[~contained]
+part_areas = shapely.area(shapely.intersection(builtup_geoms[part_bu], buffers[part_sub]))
+
+sub_ids = np.concatenate([cont_sub, part_sub])
+pair_areas = np.concatenate([builtup_areas[cont_bu], part_areas])
+# Scatter-add pair areas into per-substation totals (single C loop)
+subs["builtup_area"] = np.bincount(sub_ids, weights=pair_areas, minlength=len(subs))
+
+# Handle empty areas (rural substations)
+subs["builtup_area"] = subs["builtup_area"].replace(0, subs["builtup_area"].mean() * 0.1)
+
+# Normalize
+subs["demand_weight"] = subs["builtup_area"] / subs["builtup_area"].sum()
+
+# ======================================================
+# SAVE RESULTS
+# ======================================================
+os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+
+subs_out = subs[["name", "demand_weight"]].copy()
+subs_out.to_csv(OUTPUT_PATH, index=False)
+
+print(f"✅ Saved demand weights → {OUTPUT_PATH}")
+print(subs_out.head())
+print(f"Sum of weights: {subs_out['demand_weight'].sum():.4f} (should be 1.0000)")
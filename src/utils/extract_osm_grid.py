@@ -6,6 +6,7 @@
 # ============================================================
 
 import os
+import pandas as pd
 import geopandas as gpd
 import osmnx as ox
 import folium
@@ -69,16 +70,22 @@ def extract_osm_ireland_110kv(out_dir="data/osm"):
             ).add_to(m)
 
         # Add substations
-        for _, row in substations.iterrows():
-            if row.geometry.geom_type == "Point":
-                folium.CircleMarker(
-                    location=[row.geometry.y, row.geometry.x],
-                    radius=4,
-                    color="red",
-                    fill=True,
-                    fill_opacity=0.7,
-                    popup=row.get("name", "Unnamed 110 kV Substation"),
-                ).add_to(m)
+        pts = substations[substations.geometry.geom_type == "Point"]
+        xs, ys = pts.geometry.x.to_numpy(), pts.geometry.y.to_numpy()
+        names = (
+            pts.get("name", pd.Series(index=pts.index, dtype=object))
+            .fillna("Unnamed 110 kV Substation")
+            .to_numpy()
+        )
+        for x, y, name in zip(xs, ys, names):
+            folium.CircleMarker(
+                location=[y, x],
+                radius=4,
+                color="red",
+                fill=True,
+                fill_opacity=0.7,
+                popup=name,
+            ).add_to(m)
 
         folium.LayerControl(collapsed=False).add_to(m)
 
@@ -28,6 +28,8 @@ import xarray as xr
 import numpy as np
 import pandas as pd
 import rioxarray
+import dask
+from dask.diagnostics import ProgressBar
 
 # ============================================================
 # CONFIG
@@ -61,8 +63,15 @@ for f in nc_files:
 # MERGE ALL YEARS
 # ============================================================
 print("🔗 Merging yearly datasets...")
-datasets = [xr.open_dataset(f) for f in nc_files]
-ds_all = xr.concat(datasets, dim="time")
+# Lazy, one dask chunk per yearly file: reductions below stream through
+# the archive instead of loading every year into memory up front
+ds_all = xr.open_mfdataset(
+    nc_files,
+    combine="nested",
+    concat_dim="time",
+    parallel=True,
+    chunks={"time": -1},
+)
 print(f"✅ Combined dataset shape: {ds_all.dims}")
 
 # Detect data variable
@@ -74,41 +83,46 @@ print(f"📊 Using variable: {varname}")
 # ============================================================
 print("🧮 Computing 30-year mean and standard deviation...")
 
-mean_wind = ds_all[varname].mean(dim="time", keep_attrs=True)
-std_wind = ds_all[varname].std(dim="time", keep_attrs=True)
+# Single pass over the archive: Σx, Σx² and the valid count are computed
+# together so each chunk is read once (float64 to keep Σx² - n·mean² stable)
+wind64 = ds_all[varname].astype("float64")
+s1, s2, n = dask.compute(
+    wind64.sum(dim="time"),
+    (wind64 ** 2).sum(dim="time"),
+    wind64.count(dim="time"),
+)
+# FP32 is ample precision for 10 m wind climatology rasters
+mean_wind = (s1 / n).astype("float32")
+std_wind = np.sqrt((s2 / n - (s1 / n) ** 2).clip(min=0)).astype("float32")
+mean_wind.attrs = ds_all[varname].attrs
+std_wind.attrs = ds_all[varname].attrs
 
 # ============================================================
 # COMPUTE MONTHLY & SEASONAL CLIMATOLOGY
 # ============================================================
 print("📆 Computing monthly and seasonal climatologies...")
 
-# Monthly climatology
-monthly_clim = ds_all[varname].groupby("time.month").mean(dim="time")
+# Monthly climatology of the national mean: reduce lat/lon first so the
+# groupby only sees a 1-D time series (same result, mean is linear)
+national_ts = ds_all[varname].mean(dim=["lat", "lon"])
+monthly_clim = national_ts.groupby("time.month").mean(dim="time")
 
 # Convert to DataFrame
-monthly_df = monthly_clim.mean(dim=["lat", "lon"]).to_dataframe(name="wind_speed_10m").reset_index()
+monthly_df = monthly_clim.to_dataframe(name="wind_speed_10m").reset_index()
 monthly_df["month_name"] = pd.to_datetime(monthly_df["month"], format='%m').dt.strftime('%b')
 monthly_df = monthly_df[["month", "month_name", "wind_speed_10m"]]
 monthly_df.to_csv(OUT_MONTHLY_CSV, index=False)
 print(f"✅ Saved monthly climatology → {OUT_MONTHLY_CSV}")
 
-# Seasonal climatology
-seasons = {
-    "DJF": [12, 1, 2],
-    "MAM": [3, 4, 5],
-    "JJA": [6, 7, 8],
-    "SON": [9, 10, 11],
-}
-
-seasonal_means = {}
-for name, months in seasons.items():
-    sel = ds_all[varname].where(ds_all["time.month"].isin(months), drop=True)
-    seasonal_means[name] = sel.mean(dim="time")
+# Seasonal climatology (single groupby pass over DJF/MAM/JJA/SON)
+seasonal_clim = national_ts.groupby("time.season").mean(dim="time", keep_attrs=True)
 
-seasonal_df = pd.DataFrame({
-    "Season": list(seasonal_means.keys()),
-    "MeanWind": [float(v.mean().values) for v in seasonal_means.values()]
-})
+seasonal_df = (
+    seasonal_clim.to_dataframe(name="MeanWind")
+    .reindex(["DJF", "MAM", "JJA", "SON"])
+    .rename_axis("Season")
+    .reset_index()[["Season", "MeanWind"]]
+)
 seasonal_df.to_csv(OUT_SEASONAL_CSV, index=False)
 print(f"✅ Saved seasonal climatology → {OUT_SEASONAL_CSV}")
 
@@ -117,17 +131,39 @@ print(f"✅ Saved seasonal climatology → {OUT_SEASONAL_CSV}")
 # ============================================================
 print("💾 Saving merged dataset and derived products...")
 
-# Save combined NetCDF
-ds_all.to_netcdf(OUT_COMBINED)
+# Save combined NetCDF (float32, zlib-compressed, chunked along time)
+encoding = {
+    varname: {
+        "zlib": True,
+        "complevel": 4,
+        "dtype": "float32",
+        "chunksizes": (
+            min(720, ds_all.sizes["time"]),
+            ds_all.sizes["lat"],
+            ds_all.sizes["lon"],
+        ),
+    }
+}
+with ProgressBar():
+    ds_all.to_netcdf(OUT_COMBINED, encoding=encoding)
 
-# Save GeoTIFFs
+# Save GeoTIFFs as Cloud-Optimized GeoTIFFs: 256×256 internal tiles so
+# windowed reads only touch the tiles they need, DEFLATE with the
+# floating-point predictor on float32 data
 for da, path, label in [
     (mean_wind, OUT_MEAN_TIF, "mean wind"),
     (std_wind, OUT_STD_TIF, "wind variability (std)"),
 ]:
     da.rio.set_spatial_dims(x_dim="lon", y_dim="lat", inplace=True)
     da.rio.write_crs("EPSG:4326", inplace=True)
-    da.rio.to_raster(path)
+    da.astype("float32").rio.to_raster(
+        path,
+        driver="COG",
+        dtype="float32",
+        compress="DEFLATE",
+        predictor=3,
+        blocksize=256,
+    )
     print(f"✅ Saved {label} → {path}")
 
 print("🎉 All done!")
@@ -0,0 +1,49 @@
+# ============================================================
+# 🚀 AI-ASSISTED CODE NOTICE
+# This file was developed with assistance from OpenAI's ChatGPT (GPT-5)
+# as part of the NASA Space Apps 2025 project:
+# “TerraWatt — Will It Rain on My Parade?”
+# ============================================================
+
+"""
+vector_cache.py
+---------------
+Reads vector layers (shapefiles, GeoJSON, ...) through a GeoParquet copy kept
+next to the source file, so repeated loads skip the slow OGR parse.
+"""
+
+import hashlib
+import os
+import geopandas as gpd
+from pyproj import CRS
+
+
+def _crs_tag(crs):
+    """Short file-name tag for a CRS: its EPSG code, or a WKT digest."""
+    target = CRS.from_user_input(crs)
+    epsg = target.to_epsg()
+    if epsg is not None:
+        return str(epsg)
+    return hashlib.md5(target.to_wkt().encode()).hexdigest()[:8]
+
+
+def read_file_cached(path, crs="EPSG:4326"):
+    """
+    Read a vector file reprojected to `crs`, via a GeoParquet cache.
+
+    The cache lives next to the source as `<path>.<epsg>.parquet` (one per
+    target CRS) and is rebuilt whenever the source file is newer than the
+    cache. Layers without a CRS are returned as read, not reprojected.
+    """
+    cache = f"{path}.{_crs_tag(crs)}.parquet"
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        return gpd.read_parquet(cache)
+
+    gdf = gpd.read_file(path, engine="pyogrio")
+    if gdf.crs and gdf.crs != CRS.from_user_input(crs):
+        gdf = gdf.to_crs(crs)
+    try:
+        gdf.to_parquet(cache)
+    except Exception as e:
+        print(f"⚠️ Could not write parquet cache {cache}: {e}")
+    return gdf
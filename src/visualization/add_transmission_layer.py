@@ -9,6 +9,7 @@ import geopandas as gpd
 import folium
 import pandas as pd
 import numpy as np
+import shapely
 
 def add_transmission_layer(m, lines_path, subs_path=None, label="⚡ 110 kV Transmission Grid"):
     """
@@ -21,15 +22,18 @@ def add_transmission_layer(m, lines_path, subs_path=None, label="⚡ 110 kV Tran
             return gdf
 
         for col in gdf.columns:
+            dtype = gdf[col].dtype
             # Convert datetime / Timestamp columns → string
-            if pd.api.types.is_datetime64_any_dtype(gdf[col]) or (
-                len(gdf[col]) > 0 and isinstance(gdf[col].iloc[0], pd.Timestamp)
-            ):
+            if pd.api.types.is_datetime64_any_dtype(dtype):
                 gdf[col] = gdf[col].astype(str)
-            # Convert unsupported objects (lists, dicts, numpy types)
-            gdf[col] = gdf[col].apply(
-                lambda x: str(x) if isinstance(x, (dict, list, np.generic)) else x
-            )
+            # Only object columns can hold unsupported values (lists, dicts,
+            # numpy scalars, Timestamps); numeric/bool/geometry are left as-is
+            elif dtype == object:
+                gdf[col] = gdf[col].map(
+                    lambda x: str(x)
+                    if isinstance(x, (dict, list, np.generic, pd.Timestamp))
+                    else x
+                )
         return gdf
 
     try:
@@ -70,15 +74,21 @@ def add_transmission_layer(m, lines_path, subs_path=None, label="⚡ 110 kV Tran
 
     # --- Add substations ---
     if not subs.empty:
-        for _, row in subs.iterrows():
-            geom = row.geometry.centroid if row.geometry.geom_type != "Point" else row.geometry
+        # Centroid is a no-op for Points; x/y are pulled for all rows in one call
+        centroids = shapely.centroid(subs.geometry.to_numpy())
+        xs, ys = shapely.get_x(centroids), shapely.get_y(centroids)
+        names = (
+            subs["name"].to_numpy() if "name" in subs.columns
+            else np.full(len(subs), "Unnamed substation", dtype=object)
+        )
+        for x, y, name in zip(xs, ys, names):
             folium.CircleMarker(
-                location=[geom.y, geom.x],
+                location=[y, x],
                 radius=4,
                 color="red",
                 fill=True,
                 fill_opacity=0.8,
-                popup=row.get("name", "Unnamed substation"),
+                popup=name,
             ).add_to(m)
 
     folium.LayerControl(collapsed=False).add_to(m)
@@ -14,19 +14,31 @@ from matplotlib.colors import Normalize
 def add_raster_layer(m, tif_path, name, cmap="viridis", opacity=0.7, vmin=None, vmax=None):
     """Add a GeoTIFF as an interactive Folium overlay with correct color mapping."""
     with rasterio.open(tif_path) as src:
-        arr = src.read(1)
         bounds = src.bounds
         lat_min, lat_max = bounds.bottom, bounds.top
         lon_min, lon_max = bounds.left, bounds.right
+        # Walk the file tile by tile (COG blocks) instead of reading it whole
+        windows = [w for _, w in src.block_windows(1)]
 
-        # Handle range
-        if vmin is None: vmin = np.nanmin(arr)
-        if vmax is None: vmax = np.nanmax(arr)
+        # Handle range: running NaN-ignoring min/max in one pass over the blocks
+        if vmin is None or vmax is None:
+            lo, hi = np.inf, -np.inf
+            for window in windows:
+                block = src.read(1, window=window)
+                lo = np.fmin(lo, np.fmin.reduce(block, axis=None))
+                hi = np.fmax(hi, np.fmax.reduce(block, axis=None))
+            if vmin is None: vmin = lo
+            if vmax is None: vmax = hi
 
-        # Normalize + apply colormap
+        # Normalize + apply colormap block by block into a preallocated RGBA
         norm = Normalize(vmin=vmin, vmax=vmax)
         cmap_obj = mpl_cm.get_cmap(cmap)
-        rgba_img = (cmap_obj(norm(arr)) * 255).astype(np.uint8)
+        rgba_img = np.empty((src.height, src.width, 4), dtype=np.uint8)
+        for window in windows:
+            block = src.read(1, window=window)
+            rows = slice(window.row_off, window.row_off + window.height)
+            cols = slice(window.col_off, window.col_off + window.width)
+            rgba_img[rows, cols] = cmap_obj(norm(block), bytes=True)
 
         # Folium expects a (M, N, 4) RGBA array
         folium.raster_layers.ImageOverlay(
@@ -101,9 +101,11 @@ def get_era5_wind_grid(lat_min, lat_max, lon_min, lon_max, start, end, out_prefi
 
     # Convert longitudes from [0,360] → [-180,180]
     if "lon" in df.columns:
-        df["lon"] = df["lon"].apply(lambda x: x - 360 if x > 180 else x)
+        lon = df["lon"].to_numpy()
+        df["lon"] = lon - 360.0 * (lon > 180)
     elif "longitude" in df.columns:
-        df["longitude"] = df["longitude"].apply(lambda x: x - 360 if x > 180 else x)
+        lon = df["longitude"].to_numpy()
+        df["longitude"] = lon - 360.0 * (lon > 180)
 
     # Drop NaNs, enforce float
     df = df.dropna(subset=["wind_speed"])
@@ -115,8 +117,8 @@ def get_era5_wind_grid(lat_min, lat_max, lon_min, lon_max, start, end, out_prefi
         print(f"📊 Final DataFrame: {df.shape}")
         print(df.head())
 
-    # --- Save outputs ---
-    csv_path = f"{out_prefix}.csv"
+    # --- Save outputs (Parquet: columnar + compressed, fast column-selective reads) ---
+    parquet_path = f"{out_prefix}.parquet"
     readme_path = f"{out_prefix}_README.txt"
 
     citation = (
@@ -128,13 +130,13 @@ def get_era5_wind_grid(lat_min, lat_max, lon_min, lon_max, start, end, out_prefi
         "# License: Contains modified Copernicus Climate Change Service information [Year]\n"
     )
 
-    df.to_csv(csv_path, index=False)
+    df.to_parquet(parquet_path, index=False)
     with open(readme_path, "w") as f:
         f.write(citation)
 
-    print(f"💾 Saved {csv_path} and {readme_path}")
+    print(f"💾 Saved {parquet_path} and {readme_path}")
 
-    return df, csv_path, readme_path
+    return df, parquet_path, readme_path
 
 
 def _export_with_citation(df, out_prefix, start, end):
@@ -187,7 +189,7 @@ def add_era5_layer(m, df, label="🌬 ERA5 Wind 10m"):
     else:
         ws_norm = (ws - ws_min) / (ws_max - ws_min)
 
-    heat_data = [[row[lat_col], row[lon_col], val] for (_, row), val in zip(df.iterrows(), ws_norm)]
+    heat_data = np.column_stack([df[lat_col].to_numpy(), df[lon_col].to_numpy(), ws_norm]).tolist()
 
     HeatMap(
         heat_data,
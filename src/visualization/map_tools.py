@@ -5,9 +5,17 @@
 # “TerraWatt — Will It Rain on My Parade?”
 # ============================================================
 
+"""
+Folium helpers for drawing and reading the analysis bounding box.
+"""
+
 import folium
 from folium.plugins import Draw
 import math
+import numpy as np
+from functools import lru_cache
+
+KM_PER_DEG = 111.32  # km per degree of latitude
 
 
 def add_draw_tools(m):
@@ -44,26 +52,30 @@ def get_bbox_from_stdata(st_data):
     if not geom or "geometry" not in geom or geom["geometry"]["type"] != "Polygon":
         return None
 
-    coords = geom["geometry"]["coordinates"][0]
-    lats = [float(c[1]) for c in coords]
-    lons = [float(c[0]) for c in coords]
-    lat_min, lat_max = min(lats), max(lats)
-    lon_min, lon_max = min(lons), max(lons)
+    coords = np.asarray(geom["geometry"]["coordinates"][0], dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] < 2:
+        return None
+    lat_min, lat_max = float(coords[:, 1].min()), float(coords[:, 1].max())
+    lon_min, lon_max = float(coords[:, 0].min()), float(coords[:, 0].max())
     return lat_min, lat_max, lon_min, lon_max
 
 
+@lru_cache(maxsize=256)
+def _km_per_deg_lon(lat_mid_decideg):
+    """Length of one degree of longitude (km) at a latitude given in 0.1° steps."""
+    return KM_PER_DEG * math.cos(math.radians(lat_mid_decideg * 0.1))
+
+
 def is_bbox_too_small(lat_min, lat_max, lon_min, lon_max, min_km=28.0):
     """
     Check if the bounding box is smaller than the minimum resolution.
     Returns True if too small.
     """
-    km_per_deg_lat = 111.32
-    km_per_deg_lon = 111.32 * math.cos(math.radians((lat_min + lat_max) / 2))
-
-    lat_km = abs(lat_max - lat_min) * km_per_deg_lat
-    lon_km = abs(lon_max - lon_min) * km_per_deg_lon
-
-    return lat_km < min_km or lon_km < min_km
+    if abs(lat_max - lat_min) * KM_PER_DEG < min_km:
+        return True
+    # Mid-latitude rounded to 0.1° so repeated boxes hit the cosine cache
+    lon_km = abs(lon_max - lon_min) * _km_per_deg_lon(round((lat_min + lat_max) * 5))
+    return lon_km < min_km
 
 
 def is_valid_bbox(lat_min, lat_max, lon_min, lon_max, max_span=5.0):
@@ -80,14 +92,10 @@ def draw_bbox_on_map(m, lat_min, lat_max, lon_min, lon_max, color="blue", visibl
         return m  # skip drawing if not explicitly requested
 
     try:
-        bounds = [
-            [lat_min, lon_min],
-            [lat_min, lon_max],
-            [lat_max, lon_max],
-            [lat_max, lon_min],
-            [lat_min, lon_min],
-        ]
-        folium.PolyLine(bounds, color=color, weight=3, opacity=0.8).add_to(m)
+        folium.Rectangle(
+            bounds=[(lat_min, lon_min), (lat_max, lon_max)],
+            color=color, weight=3, opacity=0.8, fill=False,
+        ).add_to(m)
     except Exception as e:
         print(f"⚠️ Could not draw rectangle: {e}")
     return m
@@ -29,12 +29,18 @@ Creates interactive 3D maps showing optimal development areas
 with wind resources, grid connectivity, and economic factors.
 """
 
+import os
+import hashlib
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+import shapely
 import streamlit as st
 import folium
+from folium import plugins
 from streamlit_folium import st_folium
-from src.analysis.optimal_zones import generate_optimal_zones
+from src.analysis.optimal_zones import generate_optimal_zones, calculate_optimal_zones_with_progress
+from src.analysis.onshore_offshore import classify_onshore_offshore, determine_onshore_offshore_simple
 
 # Try to import pydeck, fallback to folium if not available
 try:
@@ -53,6 +59,11 @@ ZONE_COLORS = {
     "Marginal": [255, 165, 0, 120]      # Orange
 }
 
+DEFAULT_ZONE_COLOR = [128, 128, 128, 150]  # Grey (unknown category)
+
+# Zone categories in color-table order; the extra last row is the default
+ZONE_CATS = list(ZONE_COLORS)
+
 WIND_COLORS = [
     [255, 0, 0, 200],      # Red (low wind)
     [255, 165, 0, 200],    # Orange
@@ -61,128 +72,224 @@ WIND_COLORS = [
     [0, 0, 255, 200]       # Blue (very high wind)
 ]
 
+GRID_COLORS = [
+    [0, 255, 0, 180],      # Green (close)
+    [255, 255, 0, 160],    # Yellow
+    [255, 165, 0, 140],    # Orange
+    [255, 0, 0, 120]       # Red (far)
+]
+
+# Bucket edges for the wind (m/s, strict <) and grid (km, inclusive <=) colors
+WIND_BINS = [6, 7, 8, 9]
+GRID_BINS = [10, 20, 30]
+
+def _color_ramp_expression(field, op, edges, colors):
+    """
+    deck.gl accessor expression returning colors[i] for the first edge where
+    `field op edge` holds, else the last color (also what NaN falls through to).
+    """
+    expr = str(list(colors[-1]))
+    for edge, color in reversed(list(zip(edges, colors))):
+        expr = f"{field} {op} {edge} ? {list(color)} : {expr}"
+    return expr
+
+# Colors are computed on the client from these accessors, so layer records
+# carry only the value (or category code) instead of an RGBA list per row
+ZONE_COLOR_EXPR = _color_ramp_expression(
+    'cat_code', '==', range(len(ZONE_CATS)),
+    [ZONE_COLORS[c] for c in ZONE_CATS] + [DEFAULT_ZONE_COLOR]
+)
+WIND_COLOR_EXPR = _color_ramp_expression('wind_speed', '<', WIND_BINS, WIND_COLORS)
+GRID_COLOR_EXPR = _color_ramp_expression('grid_distance', '<=', GRID_BINS, GRID_COLORS)
+
+# Zone columns read by the Pydeck layers (also what the cache key hashes);
+# only position, color and tooltip fields are sent to the client
+ZONE_LAYER_COLUMNS = [
+    'latitude', 'longitude', 'composite_score',
+    'wind_speed_mps', 'grid_distance_km', 'grid_cost_eur', 'zone_category'
+]
+
+# Numeric layer columns held as float32 in the shared layer frame
+# (grid_cost stays float64: float32 would lose whole euros above ~16M)
+LAYER_FLOAT32_COLUMNS = [
+    'lat', 'lon', 'composite_score', 'wind_speed', 'grid_distance'
+]
+
+# Decimal places kept per column when layer data is written into the deck
+# JSON (~1 m for coordinates); shorter numbers mean a smaller payload
+LAYER_DECIMALS = {
+    'lat': 5, 'lon': 5,
+    'wind_speed': 2, 'grid_distance': 2, 'grid_cost': 0,
+    'composite_score': 3, 'avg_score': 3, 'avg_wind_speed': 2
+}
+# The same precision under the zone frame's own column names, applied when
+# zones are written out as text (Folium zones layer, CSV download)
+ZONE_DISPLAY_DECIMALS = {
+    'latitude': LAYER_DECIMALS['lat'], 'longitude': LAYER_DECIMALS['lon'],
+    'wind_speed_mps': LAYER_DECIMALS['wind_speed'],
+    'grid_distance_km': LAYER_DECIMALS['grid_distance'],
+    'grid_cost_eur': LAYER_DECIMALS['grid_cost'],
+    'composite_score': LAYER_DECIMALS['composite_score']
+}
+# Same idea for Folium payloads: heatmap intensities are 0-1 weights
+HEAT_INTENSITY_DECIMALS = 3
+# Transmission lines are simplified to this tolerance (degrees, ~50 m)
+# before being sent to the browser
+LINE_SIMPLIFY_TOLERANCE = 0.0005
+
+# Wind layer in 'grid' mode: GPU-aggregated cells, used from this many zones up
+WIND_GRID_MIN_POINTS = 5000
+WIND_GRID_CELL_M = 5000
+
 # ============================================================
 # LAYER CREATION
 # ============================================================
-def create_optimal_zones_layer(zones_gdf):
+def _compact_layer_data(df):
+    """Round numeric layer columns so the deck JSON carries short numbers."""
+    # float32 values widen to long Python floats; round them in float64
+    wide = {c: np.float64 for c in df.columns if df[c].dtype == np.float32}
+    return df.astype(wide).round(LAYER_DECIMALS).to_dict('records')
+
+def zones_data_key(zones_gdf):
+    """
+    Cheap content hash of the zone columns the layers read.
+    Used as the Streamlit cache key so the cache never hashes the frame itself.
+    """
+    return int(pd.util.hash_pandas_object(zones_gdf[ZONE_LAYER_COLUMNS], index=True).sum())
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _layer_frame(data_key, _zones_gdf):
+    """
+    Renamed zone columns plus the zone category code, built in one pass
+    and shared (not copied) by the three zone layers.
+    """
+    df = _zones_gdf[ZONE_LAYER_COLUMNS].rename(columns={
+        'latitude': 'lat',
+        'longitude': 'lon',
+        'wind_speed_mps': 'wind_speed',
+        'grid_distance_km': 'grid_distance',
+        'grid_cost_eur': 'grid_cost'
+    })
+    # float32 is plenty for display (~0.5 m in position) and halves the cached frame
+    df = df.astype({c: np.float32 for c in LAYER_FLOAT32_COLUMNS})
+    # Category codes pick the color in ZONE_COLOR_EXPR; unknown (-1) → grey
+    codes = pd.Categorical(df['zone_category'], categories=ZONE_CATS).codes
+    df['cat_code'] = np.where(codes < 0, len(ZONE_CATS), codes).astype(np.uint8)
+    return df
+
+@st.cache_data(show_spinner=False)
+def _zones_layer_data(data_key, _zones_gdf):
+    """Records for the optimal zones layer (cached per `data_key`)."""
+    df = _layer_frame(data_key, _zones_gdf)
+    
+    # Prepare data for Pydeck (column-wise, one record per zone)
+    df = df[[
+        'lat', 'lon', 'composite_score', 'wind_speed', 'grid_distance',
+        'grid_cost', 'zone_category', 'cat_code'
+    ]]
+    return _compact_layer_data(df)
+
+def create_optimal_zones_layer(zones_gdf, data_key=None):
     """Create Pydeck layer for optimal zones."""
-    
-    # Prepare data for Pydeck
-    zones_data = []
-    for _, row in zones_gdf.iterrows():
-        zones_data.append({
-            'lat': row['latitude'],
-            'lon': row['longitude'],
-            'wind_score': row['wind_score'],
-            'grid_score': row['grid_score'],
-            'composite_score': row['composite_score'],
-            'wind_speed': row['wind_speed_mps'],
-            'grid_distance': row['grid_distance_km'],
-            'grid_cost': row['grid_cost_eur'],
-            'zone_category': row['zone_category'],
-            'color': ZONE_COLORS.get(row['zone_category'], [128, 128, 128, 150])
-        })
+    if data_key is None:
+        data_key = zones_data_key(zones_gdf)
     
     return pdk.Layer(
         'ScatterplotLayer',
-        data=zones_data,
+        data=_zones_layer_data(data_key, zones_gdf),
         get_position='[lon, lat]',
-        get_fill_color='color',
+        get_fill_color=ZONE_COLOR_EXPR,
         get_radius=2000,  # 2km radius
         pickable=True,
         auto_highlight=True,
         opacity=0.8
     )
 
-def create_wind_heatmap_layer(zones_gdf):
-    """Create wind speed heatmap layer."""
-    
-    # Prepare wind data
-    wind_data = []
-    for _, row in zones_gdf.iterrows():
-        # Color based on wind speed
-        wind_speed = row['wind_speed_mps']
-        if wind_speed < 6:
-            color = WIND_COLORS[0]  # Red
-        elif wind_speed < 7:
-            color = WIND_COLORS[1]  # Orange
-        elif wind_speed < 8:
-            color = WIND_COLORS[2]  # Yellow
-        elif wind_speed < 9:
-            color = WIND_COLORS[3]  # Green
-        else:
-            color = WIND_COLORS[4]  # Blue
-        
-        wind_data.append({
-            'lat': row['latitude'],
-            'lon': row['longitude'],
-            'wind_speed': wind_speed,
-            'color': color
-        })
+@st.cache_data(show_spinner=False)
+def _wind_layer_data(data_key, _zones_gdf):
+    """Records for the wind speed layer (cached per `data_key`)."""
+    df = _layer_frame(data_key, _zones_gdf)
+    df = df[['lat', 'lon', 'wind_speed']]
+    return _compact_layer_data(df)
+
+def create_wind_heatmap_layer(zones_gdf, data_key=None, mode='points'):
+    """
+    Create wind speed heatmap layer.
+    
+    mode='grid' aggregates zones into WIND_GRID_CELL_M cells on the GPU
+    (mean wind speed per cell), so drawing cost follows the number of
+    cells rather than zones; below WIND_GRID_MIN_POINTS zones it falls
+    back to the point layer.
+    """
+    if data_key is None:
+        data_key = zones_data_key(zones_gdf)
+    wind_data = _wind_layer_data(data_key, zones_gdf)
+    
+    if mode == 'grid' and len(wind_data) >= WIND_GRID_MIN_POINTS:
+        return pdk.Layer(
+            'GridLayer',
+            data=wind_data,
+            get_position='[lon, lat]',
+            get_color_weight='wind_speed',
+            color_aggregation='"MEAN"',  # quoted: a literal, not an accessor
+            color_range=[color[:3] for color in WIND_COLORS],
+            cell_size=WIND_GRID_CELL_M,
+            coverage=0.9,
+            extruded=False,
+            gpu_aggregation=True,
+            pickable=True,
+            auto_highlight=True,
+            opacity=0.6
+        )
     
     return pdk.Layer(
         'ScatterplotLayer',
         data=wind_data,
         get_position='[lon, lat]',
-        get_fill_color='color',
+        get_fill_color=WIND_COLOR_EXPR,
         get_radius=1500,  # 1.5km radius
         pickable=True,
         auto_highlight=True,
         opacity=0.6
     )
 
-def create_grid_connectivity_layer(zones_gdf):
+@st.cache_data(show_spinner=False)
+def _grid_layer_data(data_key, _zones_gdf):
+    """Records for the grid connectivity layer (cached per `data_key`)."""
+    df = _layer_frame(data_key, _zones_gdf)
+    df = df[['lat', 'lon', 'grid_distance', 'grid_cost']]
+    return _compact_layer_data(df)
+
+def create_grid_connectivity_layer(zones_gdf, data_key=None):
     """Create grid connectivity visualization layer."""
-    
-    grid_data = []
-    for _, row in zones_gdf.iterrows():
-        # Color based on grid distance (closer = better)
-        grid_dist = row['grid_distance_km']
-        if grid_dist <= 10:
-            color = [0, 255, 0, 180]      # Green (close)
-        elif grid_dist <= 20:
-            color = [255, 255, 0, 160]    # Yellow
-        elif grid_dist <= 30:
-            color = [255, 165, 0, 140]    # Orange
-        else:
-            color = [255, 0, 0, 120]      # Red (far)
-        
-        grid_data.append({
-            'lat': row['latitude'],
-            'lon': row['longitude'],
-            'grid_distance': grid_dist,
-            'grid_cost': row['grid_cost_eur'],
-            'color': color
-        })
+    if data_key is None:
+        data_key = zones_data_key(zones_gdf)
     
     return pdk.Layer(
         'ScatterplotLayer',
-        data=grid_data,
+        data=_grid_layer_data(data_key, zones_gdf),
         get_position='[lon, lat]',
-        get_fill_color='color',
+        get_fill_color=GRID_COLOR_EXPR,
         get_radius=1000,  # 1km radius
         pickable=True,
         auto_highlight=True,
         opacity=0.7
     )
 
+@st.cache_data(show_spinner=False)
+def _cluster_layer_data(cluster_stats):
+    """Records for the cluster centers layer (cluster_stats is small; hashed directly)."""
+    df = pd.DataFrame(cluster_stats)[[
+        'centroid_lat', 'centroid_lon', 'cluster_id', 'count', 'avg_score', 'avg_wind_speed'
+    ]].rename(columns={'centroid_lat': 'lat', 'centroid_lon': 'lon'})
+    return _compact_layer_data(df)
+
 def create_cluster_centers_layer(cluster_stats):
     """Create layer showing cluster centers."""
     
-    cluster_data = []
-    for cluster in cluster_stats:
-        cluster_data.append({
-            'lat': cluster['centroid_lat'],
-            'lon': cluster['centroid_lon'],
-            'cluster_id': cluster['cluster_id'],
-            'count': cluster['count'],
-            'avg_score': cluster['avg_score'],
-            'avg_wind_speed': cluster['avg_wind_speed']
-        })
-    
     return pdk.Layer(
         'ScatterplotLayer',
-        data=cluster_data,
+        data=_cluster_layer_data(cluster_stats),
         get_position='[lon, lat]',
         get_fill_color='[255, 0, 255, 200]',  # Magenta
         get_radius=5000,  # 5km radius
@@ -213,6 +320,18 @@ def get_zone_tooltip():
         }
     }
 
+# Aggregated cells expose the mean as colorValue and the zone count as count
+WIND_GRID_TOOLTIP = {
+    'html': '''
+    <div style="background-color: white; padding: 10px; border-radius: 5px;">
+        <h3 style="margin: 0 0 5px 0; color: #333;">Wind Resource</h3>
+        <p style="margin: 2px 0;"><b>Mean Wind Speed:</b> {colorValue} m/s</p>
+        <p style="margin: 2px 0;"><b>Zones:</b> {count}</p>
+    </div>
+    ''',
+    'style': {'backgroundColor': 'white', 'color': 'black'}
+}
+
 def get_cluster_tooltip():
     """Get tooltip template for cluster centers."""
     return {
@@ -233,7 +352,7 @@ def get_cluster_tooltip():
 # ============================================================
 # MAIN VISUALIZATION
 # ============================================================
-def create_optimal_zones_map(zones_gdf=None, cluster_stats=None, show_layers=None):
+def create_optimal_zones_map(zones_gdf=None, cluster_stats=None, show_layers=None, wind_mode='points'):
     """
     Create Pydeck map for optimal zones visualization.
     
@@ -245,6 +364,8 @@ def create_optimal_zones_map(zones_gdf=None, cluster_stats=None, show_layers=Non
         Cluster statistics
     show_layers : dict
         Dictionary controlling which layers to show
+    wind_mode : str
+        'points' or 'grid' (see create_wind_heatmap_layer)
     
     Returns:
     --------
@@ -264,17 +385,32 @@ def create_optimal_zones_map(zones_gdf=None, cluster_stats=None, show_layers=Non
             'cluster_centers': True
         }
     
+    # Reruns with the same zones, clusters and layer toggles reuse the built deck
+    return _build_optimal_zones_deck(
+        zones_data_key(zones_gdf),
+        tuple(sorted(show_layers.items())),
+        wind_mode,
+        cluster_stats,
+        zones_gdf
+    )
+
+@st.cache_resource(show_spinner=False)
+def _build_optimal_zones_deck(data_key, layer_flags, wind_mode, cluster_stats, _zones_gdf):
+    """Build the Pydeck map (cached per zones content, layer toggles, wind mode and clusters)."""
+    zones_gdf = _zones_gdf
+    show_layers = dict(layer_flags)
+    
     # Create layers
     layers = []
     
     if show_layers.get('optimal_zones', True):
-        zones_layer = create_optimal_zones_layer(zones_gdf)
+        zones_layer = create_optimal_zones_layer(zones_gdf, data_key)
         zones_layer.tooltip = get_zone_tooltip()
         layers.append(zones_layer)
     
     if show_layers.get('wind_heatmap', True):
-        wind_layer = create_wind_heatmap_layer(zones_gdf)
-        wind_layer.tooltip = {
+        wind_layer = create_wind_heatmap_layer(zones_gdf, data_key, mode=wind_mode)
+        wind_layer.tooltip = WIND_GRID_TOOLTIP if wind_layer.type == 'GridLayer' else {
             'html': '''
             <div style="background-color: white; padding: 10px; border-radius: 5px;">
                 <h3 style="margin: 0 0 5px 0; color: #333;">Wind Resource</h3>
@@ -286,7 +422,7 @@ def create_optimal_zones_map(zones_gdf=None, cluster_stats=None, show_layers=Non
         layers.append(wind_layer)
     
     if show_layers.get('grid_connectivity', False):
-        grid_layer = create_grid_connectivity_layer(zones_gdf)
+        grid_layer = create_grid_connectivity_layer(zones_gdf, data_key)
         grid_layer.tooltip = {
             'html': '''
             <div style="background-color: white; padding: 10px; border-radius: 5px;">
@@ -323,6 +459,65 @@ def create_optimal_zones_map(zones_gdf=None, cluster_stats=None, show_layers=Non
 # ============================================================
 # FOLIUM FALLBACK VISUALIZATION
 # ============================================================
+# Folium zone marker colors by category (anything else is drawn gray)
+OFFSHORE_ZONE_COLORS = {
+    'Excellent': 'blue',
+    'Good': 'lightblue',
+    'Moderate': 'cyan',
+    'Marginal': 'lightcyan'
+}
+ONSHORE_ZONE_COLORS = {
+    'Excellent': 'green',
+    'Good': 'lightgreen',
+    'Moderate': 'yellow',
+    'Marginal': 'orange'
+}
+# Same palettes indexed by ZONE_CATS code, last entry for unknown categories
+OFFSHORE_ZONE_PALETTE = np.array([OFFSHORE_ZONE_COLORS[c] for c in ZONE_CATS] + ['gray'])
+ONSHORE_ZONE_PALETTE = np.array([ONSHORE_ZONE_COLORS[c] for c in ZONE_CATS] + ['gray'])
+
+# Legend overlay for the Folium optimal zones map (same style as first page)
+ZONE_LEGEND_HTML = """
+    <div style="position: fixed; bottom: 35px; right: 20px; z-index:9999;
+                background-color: rgba(255, 255, 255, 0.92);
+                border-radius: 10px;
+                padding: 10px 15px;
+                box-shadow: 0 2px 8px rgba(0,0,0,0.15);
+                font-size: 13px;
+                color: #222;
+                line-height: 1.5;
+    ">
+    <b>🗺️ Map Legend</b><br>
+    <b>Onshore Zones:</b><br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="green" /></svg> Excellent<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="lightgreen" /></svg> Good<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="yellow" /></svg> Moderate<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="orange" /></svg> Marginal<br>
+    <b>Offshore Zones:</b><br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="blue" /></svg> Excellent<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="lightblue" /></svg> Good<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="cyan" /></svg> Moderate<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="lightcyan" /></svg> Marginal<br>
+    <b>Infrastructure:</b><br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="#009E73" /></svg> Existing Wind Farms<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="#D7263D" /></svg> Substations<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="red" /></svg> Cluster Centers<br>
+    <b>Wind Data Layers:</b><br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="blue" /></svg> Mean Wind Speed<br>
+    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="green" /></svg> Wind Variability
+    </div>
+    """
+
+# Popup template for Folium optimal zone markers
+ZONE_POPUP = (
+    "<b>Optimal Wind Zone</b><br>Category: {zone_category}"
+    "<br>Wind Speed: {wind_speed_mps:.1f} m/s"
+    "<br>Grid Distance: {grid_distance_km:.1f} km"
+    "<br>Grid Cost: €{grid_cost_eur:,.0f}"
+    "<br>Score: {composite_score:.2f}"
+)
+ZONE_POPUP_FIELDS = ['zone_category', 'wind_speed_mps', 'grid_distance_km', 'grid_cost_eur', 'composite_score']
+
 def create_folium_optimal_zones_map(zones_gdf, cluster_stats=None, show_layers=None):
     """Create folium map for optimal zones (same format as first page)."""
     
@@ -350,41 +545,42 @@ def create_folium_optimal_zones_map(zones_gdf, cluster_stats=None, show_layers=N
     
     # Add optimal zones
     if show_layers.get('optimal_zones', True):
-        for _, row in zones_gdf.iterrows():
-            # Different colors for offshore vs onshore
-            if hasattr(row, 'wind_farm_type') and row.get('wind_farm_type') == 'Offshore':
-                color = {
-                    'Excellent': 'blue',
-                    'Good': 'lightblue', 
-                    'Moderate': 'cyan',
-                    'Marginal': 'lightcyan'
-                }.get(row['zone_category'], 'gray')
-            else:  # Onshore
-                color = {
-                    'Excellent': 'green',
-                    'Good': 'lightgreen', 
-                    'Moderate': 'yellow',
-                    'Marginal': 'orange'
-                }.get(row['zone_category'], 'gray')
-            
-            folium.CircleMarker(
-                location=[row['latitude'], row['longitude']],
-                radius=8,
-                color=color,
-                fill=True,
-                fillOpacity=0.7,
-                popup=folium.Popup(
-                    f"""
-                    <b>Optimal Wind Zone</b><br>
-                    Category: {row['zone_category']}<br>
-                    Wind Speed: {row['wind_speed_mps']:.1f} m/s<br>
-                    Grid Distance: {row['grid_distance_km']:.1f} km<br>
-                    Grid Cost: €{row['grid_cost_eur']:,.0f}<br>
-                    Score: {row['composite_score']:.2f}
-                    """,
-                    max_width=200
-                )
-            ).add_to(m)
+        import geopandas as gpd
+        
+        # Colors per zone: offshore/onshore palette by category, gray otherwise
+        codes = pd.Categorical(zones_gdf['zone_category'], categories=ZONE_CATS).codes
+        codes = np.where(codes < 0, len(ZONE_CATS), codes)
+        if 'wind_farm_type' in zones_gdf.columns:
+            offshore = (zones_gdf['wind_farm_type'] == 'Offshore').to_numpy()
+        else:
+            offshore = np.zeros(len(zones_gdf), dtype=bool)
+        color = np.where(offshore, OFFSHORE_ZONE_PALETTE[codes], ONSHORE_ZONE_PALETTE[codes])
+        
+        # Popup HTML from the shared template
+        popup_html = [
+            ZONE_POPUP.format_map(zone)
+            for zone in zones_gdf[ZONE_POPUP_FIELDS].to_dict('records')
+        ]
+        
+        # One GeoJson layer (one JS object) instead of a CircleMarker per zone
+        zone_points = gpd.GeoDataFrame(
+            {'color': color, 'popup_html': popup_html},
+            geometry=gpd.points_from_xy(
+                zones_gdf['longitude'].round(ZONE_DISPLAY_DECIMALS['longitude']),
+                zones_gdf['latitude'].round(ZONE_DISPLAY_DECIMALS['latitude'])
+            ),
+            crs=4326
+        )
+        folium.GeoJson(
+            zone_points,
+            marker=folium.CircleMarker(radius=8, fill=True, fill_opacity=0.7),
+            style_function=lambda f: {
+                'color': f['properties']['color'],
+                'fillColor': f['properties']['color'],
+                'fillOpacity': 0.7
+            },
+            popup=folium.GeoJsonPopup(fields=['popup_html'], labels=False, max_width=200)
+        ).add_to(m)
     
     # Add cluster centers
     if cluster_stats:
@@ -404,54 +600,97 @@ def create_folium_optimal_zones_map(zones_gdf, cluster_stats=None, show_layers=N
             ).add_to(m)
     
     # Add legend (same style as first page)
-    legend_html = """
-    <div style="position: fixed; bottom: 35px; right: 20px; z-index:9999;
-                background-color: rgba(255, 255, 255, 0.92);
-                border-radius: 10px;
-                padding: 10px 15px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.15);
-                font-size: 13px;
-                color: #222;
-                line-height: 1.5;
-    ">
-    <b>🗺️ Map Legend</b><br>
-    <b>Onshore Zones:</b><br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="green" /></svg> Excellent<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="lightgreen" /></svg> Good<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="yellow" /></svg> Moderate<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="orange" /></svg> Marginal<br>
-    <b>Offshore Zones:</b><br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="blue" /></svg> Excellent<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="lightblue" /></svg> Good<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="cyan" /></svg> Moderate<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="lightcyan" /></svg> Marginal<br>
-    <b>Infrastructure:</b><br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="#009E73" /></svg> Existing Wind Farms<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="#D7263D" /></svg> Substations<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="red" /></svg> Cluster Centers<br>
-    <b>Wind Data Layers:</b><br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="blue" /></svg> Mean Wind Speed<br>
-    <svg width="10" height="10"><circle cx="5" cy="5" r="4" fill="green" /></svg> Wind Variability
-    </div>
-    """
-    m.get_root().html.add_child(folium.Element(legend_html))
+    m.get_root().html.add_child(folium.Element(ZONE_LEGEND_HTML))
     
     return m
 
+# Candidate attribute names for wind farm names / capacities, in priority order
+WIND_FARM_NAME_FIELDS = [
+    'Name', 'NAME', 'name', 'Site_Name', 'SITE_NAME', 'Wind_Farm', 'WIND_FARM',
+    'SiteName', 'SITENAME', 'site_name', 'wind_farm_name', 'WIND_FARM_NAME',
+    'Project', 'PROJECT', 'project_name', 'PROJECT_NAME', 'Title', 'TITLE'
+]
+WIND_FARM_CAPACITY_FIELDS = [
+    'Capacity', 'CAPACITY', 'capacity', 'MW', 'mw', 'Power', 'POWER', 'Size', 'SIZE',
+    'Installed_Capacity', 'INSTALLED_CAPACITY', 'installed_capacity',
+    'Total_Capacity', 'TOTAL_CAPACITY', 'total_capacity',
+    'Rated_Power', 'RATED_POWER', 'rated_power', 'Capacity_MW', 'CAPACITY_MW'
+]
+CAPACITY_KEYWORDS = ['capacity', 'power', 'mw', 'size', 'rated']
+MISSING_TEXT_VALUES = ['unknown', 'null', 'none', '']
+
+def resolve_name_columns(df):
+    """Priority name fields present in `df` with at least one non-null value."""
+    return [c for c in WIND_FARM_NAME_FIELDS if c in df.columns and df[c].notna().any()]
+
+def resolve_capacity_columns(df):
+    """Priority capacity fields present in `df` with at least one non-null value."""
+    return [c for c in WIND_FARM_CAPACITY_FIELDS if c in df.columns and df[c].notna().any()]
+
+def _stripped_text(col):
+    """Column as stripped strings, NaN where the value is missing/placeholder."""
+    text = col[col.notna()].astype(str).str.strip()
+    text = text[~text.str.lower().isin(MISSING_TEXT_VALUES)]
+    return text.reindex(col.index)
+
+def wind_farm_names(df):
+    """
+    extract_wind_farm_name for every row at once.
+    Candidate columns are resolved once and coalesced in the same priority
+    order the row-level function uses.
+    """
+    names = pd.Series(np.nan, index=df.index, dtype=object)
+    for col in resolve_name_columns(df):
+        names = names.fillna(_stripped_text(df[col]))
+    
+    # Fallback: first text-like value (letters, 4-99 chars) in column order
+    for col in df.columns:
+        if not names.isna().any():
+            break
+        if col == 'geometry':
+            continue
+        text = _stripped_text(df[col])
+        looks_like_name = text.str.len().between(4, 99) & text.str.contains(r'[^\W\d_]', regex=True)
+        names = names.fillna(text.where(looks_like_name))
+    
+    # If no name found, create a generic one
+    missing = names.isna()
+    names[missing] = [f"Wind Farm {idx}" for idx in df.index[missing]]
+    return names
+
+def wind_farm_capacities(df):
+    """
+    extract_wind_farm_capacity for every row at once (NaN where unknown).
+    Candidate columns are resolved once and coalesced in priority order.
+    """
+    def in_range(values):
+        return values.where((values > 0) & (values < 10000))
+    
+    caps = pd.Series(np.nan, index=df.index, dtype=float)
+    for col in resolve_capacity_columns(df):
+        # Remove common units and extract number
+        text = df[col][df[col].notna()].astype(str).str.strip()
+        text = text.str.replace('MW', '').str.replace('mw', '').str.replace('MWh', '').str.strip()
+        caps = caps.fillna(in_range(pd.to_numeric(text, errors='coerce')).reindex(df.index))
+    
+    # Fallback: numeric values in any capacity-like column
+    for col in df.columns:
+        if not caps.isna().any():
+            break
+        if col == 'geometry' or not any(k in col.lower() for k in CAPACITY_KEYWORDS):
+            continue
+        text = df[col][df[col].notna()].astype(str).str.strip()
+        caps = caps.fillna(in_range(pd.to_numeric(text, errors='coerce')).reindex(df.index))
+    return caps
+
 def extract_wind_farm_name(row):
     """Extract wind farm name from data row."""
     # Try different possible name fields (case insensitive)
-    name_fields = [
-        'Name', 'NAME', 'name', 'Site_Name', 'SITE_NAME', 'Wind_Farm', 'WIND_FARM',
-        'SiteName', 'SITENAME', 'site_name', 'wind_farm_name', 'WIND_FARM_NAME',
-        'Project', 'PROJECT', 'project_name', 'PROJECT_NAME', 'Title', 'TITLE'
-    ]
-    
-    for field in name_fields:
+    for field in WIND_FARM_NAME_FIELDS:
         if field in row and pd.notna(row[field]) and str(row[field]).strip():
             name = str(row[field]).strip()
             # Clean up the name
-            if name.lower() not in ['unknown', 'null', 'none', '']:
+            if name.lower() not in MISSING_TEXT_VALUES:
                 return name
     
     # Try to find any field that might contain a name (looks like text)
@@ -461,7 +700,7 @@ def extract_wind_farm_name(row):
             # If it looks like a name (contains letters and is reasonable length)
             if (len(value) > 3 and len(value) < 100 and 
                 any(c.isalpha() for c in value) and 
-                value.lower() not in ['unknown', 'null', 'none', '']):
+                value.lower() not in MISSING_TEXT_VALUES):
                 return value
     
     # If no name found, create a generic one
@@ -470,14 +709,7 @@ def extract_wind_farm_name(row):
 def extract_wind_farm_capacity(row):
     """Extract wind farm capacity from data row."""
     # Try different possible capacity fields
-    capacity_fields = [
-        'Capacity', 'CAPACITY', 'capacity', 'MW', 'mw', 'Power', 'POWER', 'Size', 'SIZE',
-        'Installed_Capacity', 'INSTALLED_CAPACITY', 'installed_capacity',
-        'Total_Capacity', 'TOTAL_CAPACITY', 'total_capacity',
-        'Rated_Power', 'RATED_POWER', 'rated_power', 'Capacity_MW', 'CAPACITY_MW'
-    ]
-    
-    for field in capacity_fields:
+    for field in WIND_FARM_CAPACITY_FIELDS:
         if field in row and pd.notna(row[field]):
             try:
                 value = str(row[field]).strip()
@@ -495,7 +727,7 @@ def extract_wind_farm_capacity(row):
             try:
                 value = str(row[col]).strip()
                 # Look for numeric values that could be capacity
-                if any(keyword in col.lower() for keyword in ['capacity', 'power', 'mw', 'size', 'rated']):
+                if any(keyword in col.lower() for keyword in CAPACITY_KEYWORDS):
                     capacity = float(value)
                     if 0 < capacity < 10000:  # Reasonable capacity range
                         return capacity
@@ -505,221 +737,292 @@ def extract_wind_farm_capacity(row):
     # If no capacity found, return None
     return None
 
-def create_wind_farm_popup(name, capacity, row):
-    """Create HTML popup for wind farm marker."""
-    # Start building the popup HTML
-    popup_html = f"""
+# Popup templates for wind farm markers (filled in by create_wind_farm_popup)
+WIND_FARM_POPUP_HEADER = """
     <div style="font-family: Arial, sans-serif; max-width: 280px;">
         <h3 style="margin: 0 0 10px 0; color: #2E8B57; font-size: 16px;">Wind Farm: {name}</h3>
     """
-    
-    # Add capacity if available
-    if capacity is not None:
-        popup_html += f"""
+WIND_FARM_POPUP_CAPACITY = """
         <p style="margin: 5px 0; font-size: 14px;"><b>Capacity:</b> {capacity:.1f} MW</p>
         """
-    else:
-        popup_html += f"""
+WIND_FARM_POPUP_NO_CAPACITY = """
         <p style="margin: 5px 0; font-size: 14px; color: #666;"><b>Capacity:</b> Not available</p>
         """
+WIND_FARM_POPUP_LOCATION = """
+        <p style="margin: 5px 0; font-size: 12px; color: #666;"><b>Location:</b> {lat:.4f}, {lon:.4f}</p>
+        """
+WIND_FARM_POPUP_FIELD = "<b>{field_name}:</b> {value}"
+WIND_FARM_POPUP_ITEM = '<div style="margin: 2px 0;">{info}</div>'
+WIND_FARM_POPUP_ADDITIONAL = """
+        <div style="margin-top: 10px; font-size: 12px; border-top: 1px solid #ddd; padding-top: 8px;">
+            <b>Additional Information:</b><br>
+            {items}
+        </div>
+        """
+WIND_FARM_POPUP_FOOTER = """
+    </div>
+    """
+
+def _interesting_cols(df):
+    """
+    Columns that can contribute to a wind farm popup's additional info
+    (at least one short, non-placeholder value), resolved once per layer.
+    """
+    return [
+        col for col in df.columns
+        if col not in ['geometry', 'coords'] and _stripped_text(df[col]).str.len().between(1, 99).any()
+    ]
+
+def create_wind_farm_popup(name, capacity, row, cols=None):
+    """
+    Create HTML popup for wind farm marker.
+    `cols` limits the additional-info scan (see _interesting_cols); all row
+    fields are scanned when omitted.
+    """
+    # Start building the popup HTML
+    popup_html = WIND_FARM_POPUP_HEADER.format(name=name)
+    
+    # Add capacity if available
+    if capacity is not None:
+        popup_html += WIND_FARM_POPUP_CAPACITY.format(capacity=capacity)
+    else:
+        popup_html += WIND_FARM_POPUP_NO_CAPACITY
     
     # Add coordinates
     if 'coords' in row and row['coords']:
         lat, lon = row['coords']
-        popup_html += f"""
-        <p style="margin: 5px 0; font-size: 12px; color: #666;"><b>Location:</b> {lat:.4f}, {lon:.4f}</p>
-        """
+        popup_html += WIND_FARM_POPUP_LOCATION.format(lat=lat, lon=lon)
     
     # Add any additional information from the data
     additional_info = []
-    for col in row.index:
+    for col in (row.index if cols is None else cols):
         if col not in ['geometry', 'coords'] and pd.notna(row[col]) and str(row[col]).strip():
             value = str(row[col]).strip()
             # Skip very long text fields and empty values
             if 0 < len(value) < 100 and value.lower() not in ['unknown', 'null', 'none', '']:
                 # Format the field name nicely
                 field_name = col.replace('_', ' ').title()
-                additional_info.append(f"<b>{field_name}:</b> {value}")
+                additional_info.append(WIND_FARM_POPUP_FIELD.format(field_name=field_name, value=value))
     
     if additional_info:
-        popup_html += f"""
-        <div style="margin-top: 10px; font-size: 12px; border-top: 1px solid #ddd; padding-top: 8px;">
-            <b>Additional Information:</b><br>
-            {''.join([f'<div style="margin: 2px 0;">{info}</div>' for info in additional_info[:5]])}
-        </div>
-        """
+        popup_html += WIND_FARM_POPUP_ADDITIONAL.format(
+            items=''.join([WIND_FARM_POPUP_ITEM.format(info=info) for info in additional_info[:5]])
+        )
     
-    popup_html += """
-    </div>
-    """
+    popup_html += WIND_FARM_POPUP_FOOTER
     
     return popup_html
 
+def wind_farm_popups(df, names, capacities, cols=None):
+    """
+    create_wind_farm_popup for every row at once, built column-wise with
+    string concatenation. `names`/`capacities` come from wind_farm_names /
+    wind_farm_capacities; `df` must carry the [lat, lon] 'coords' column.
+    """
+    def fill(template, key, values):
+        # Template split around its single placeholder, joined per row
+        before, after = template.split('{' + key + '}')
+        return before + values + after
+    
+    popups = fill(WIND_FARM_POPUP_HEADER, 'name', names.astype(str))
+    
+    caps = capacities.to_numpy(dtype=float)
+    has_cap = ~np.isnan(caps)
+    cap_text = np.char.mod('%.1f', np.where(has_cap, caps, 0.0))
+    popups += np.where(
+        has_cap,
+        fill(WIND_FARM_POPUP_CAPACITY, 'capacity:.1f', pd.Series(cap_text, index=df.index)),
+        WIND_FARM_POPUP_NO_CAPACITY,
+    )
+    
+    coords = np.array(df['coords'].tolist(), dtype=float).reshape(-1, 2)
+    lat_text = pd.Series(np.char.mod('%.4f', coords[:, 0]), index=df.index)
+    lon_text = pd.Series(np.char.mod('%.4f', coords[:, 1]), index=df.index)
+    location_pre, location_post = WIND_FARM_POPUP_LOCATION.split('{lat:.4f}, {lon:.4f}')
+    popups += location_pre + lat_text + ', ' + lon_text + location_post
+    
+    # Additional info: first five usable fields per row, in column order
+    items = pd.Series('', index=df.index)
+    shown = pd.Series(0, index=df.index)
+    for col in (_interesting_cols(df) if cols is None else cols):
+        text = _stripped_text(df[col])
+        usable = text.str.len().between(1, 99).fillna(False).astype(bool)
+        shown += usable
+        field = WIND_FARM_POPUP_FIELD.format(field_name=col.replace('_', ' ').title(), value='{value}')
+        item = fill(WIND_FARM_POPUP_ITEM.format(info=field), 'value', text)
+        items += item.where(usable & (shown <= 5), '')
+    popups += np.where(shown > 0, fill(WIND_FARM_POPUP_ADDITIONAL, 'items', items), '')
+    
+    return popups + WIND_FARM_POPUP_FOOTER
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+# Overpass answers are memoized per ~1 km cell (the query bbox size), so
+# neighbouring points never hit the network twice in one session.
+OVERPASS_URL = "http://overpass-api.de/api/interpreter"
+OSM_BBOX_DEG = 0.01
+
+# Query for water bodies (oceans, seas, lakes, rivers)
+OSM_WATER_FILTERS = [
+    'way["natural"="water"]', 'way["waterway"]',
+    'relation["natural"="water"]', 'relation["waterway"]',
+]
+# Query for land areas
+OSM_LAND_FILTERS = [
+    'way["natural"!="water"]["waterway"!="*"]',
+    'relation["natural"!="water"]["waterway"!="*"]',
+]
+
+def _osm_cell(lat, lon):
+    """Cache key: coordinates quantized to the 0.01° query bbox."""
+    return (round(float(lat), 2), round(float(lon), 2))
+
+def _overpass_has_elements(filters, cell, timeout):
+    """True if any OSM element matching `filters` lies in the cell's bbox."""
+    import requests
+    
+    lat, lon = cell
+    bbox = f"{lat-OSM_BBOX_DEG},{lon-OSM_BBOX_DEG},{lat+OSM_BBOX_DEG},{lon+OSM_BBOX_DEG}"
+    clauses = "\n".join(f"  {f}({bbox});" for f in filters)
+    query = f"[out:json][timeout:{timeout}];\n(\n{clauses}\n);\nout ids;"
+    response = requests.get(OVERPASS_URL, params={'data': query}, timeout=timeout)
+    response.raise_for_status()
+    return bool(response.json().get('elements'))
+
+@lru_cache(maxsize=4096)
+def _osm_cell_class(cell, timeout=25):
+    """
+    OSM classification of one cell ('Onshore' / 'Offshore' / None = no clear
+    data). Exceptions are not memoized, so a failed request is retried next time.
+    """
+    # Found water bodies -> Offshore, else land areas -> Onshore
+    if _overpass_has_elements(OSM_WATER_FILTERS, cell, timeout):
+        return 'Offshore'
+    if _overpass_has_elements(OSM_LAND_FILTERS, cell, timeout):
+        return 'Onshore'
+    return None
+
 def determine_onshore_offshore_osm(lat, lon):
     """Determine if a location is onshore or offshore using OpenStreetMap data."""
     try:
-        import requests
-        import json
-        
-        # Use Overpass API to query OpenStreetMap for land/water information
-        overpass_url = "http://overpass-api.de/api/interpreter"
-        
-        # Create a small bounding box around the point (±0.01 degrees ≈ 1km)
-        bbox = f"{lat-0.01},{lon-0.01},{lat+0.01},{lon+0.01}"
-        
-        # Query for water bodies (oceans, seas, lakes, rivers)
-        water_query = f"""
-        [out:json][timeout:25];
-        (
-          way["natural"="water"]({bbox});
-          way["waterway"]({bbox});
-          relation["natural"="water"]({bbox});
-          relation["waterway"]({bbox});
-        );
-        out geom;
-        """
-        
-        # Query for land areas
-        land_query = f"""
-        [out:json][timeout:25];
-        (
-          way["natural"!="water"]["waterway"!="*"]({bbox});
-          relation["natural"!="water"]["waterway"!="*"]({bbox});
-        );
-        out geom;
-        """
-        
-        # Check for water bodies
-        water_response = requests.get(overpass_url, params={'data': water_query}, timeout=10)
-        if water_response.status_code == 200:
-            water_data = water_response.json()
-            if water_data.get('elements'):
-                return 'Offshore'  # Found water bodies
-        
-        # Check for land areas
-        land_response = requests.get(overpass_url, params={'data': land_query}, timeout=10)
-        if land_response.status_code == 200:
-            land_data = land_response.json()
-            if land_data.get('elements'):
-                return 'Onshore'  # Found land areas
-        
-        # If no clear data, fall back to simplified method
-        return determine_onshore_offshore_simple(lat, lon)
-        
-    except Exception as e:
+        result = _osm_cell_class(_osm_cell(lat, lon))
+    except Exception:
         # Fallback to simple method if OSM query fails
-        return determine_onshore_offshore_simple(lat, lon)
-
-def determine_onshore_offshore_simple(lat, lon):
-    """Simple fallback method for onshore/offshore determination."""
-    try:
-        # Ireland's approximate boundaries (simplified)
-        ireland_bounds = {
-            'lat_min': 51.0,
-            'lat_max': 55.5,
-            'lon_min': -11.0,
-            'lon_max': -5.0
-        }
-        
-        # Check if coordinates are within Ireland bounds
-        if not (ireland_bounds['lat_min'] <= lat <= ireland_bounds['lat_max'] and 
-                ireland_bounds['lon_min'] <= lon <= ireland_bounds['lon_max']):
-            return 'Offshore'  # Outside Ireland bounds
-        
-        # Simplified onshore/offshore determination based on distance from coast
-        # Ireland's approximate coastline characteristics
-        # West coast (more exposed to Atlantic)
-        if lon < -8.5:
-            # West of -8.5° longitude - more likely offshore
-            if lat < 52.5 or lat > 54.5:
-                return 'Offshore'
-            else:
-                return 'Onshore'
-        
-        # East coast (more sheltered)
-        elif lon > -6.5:
-            # East of -6.5° longitude - more likely onshore
-            if lat < 51.5 or lat > 55.0:
-                return 'Offshore'
-            else:
-                return 'Onshore'
-        
-        # Central areas - use latitude as proxy
-        else:
-            if lat < 52.0 or lat > 55.0:
-                return 'Offshore'
-            else:
-                return 'Onshore'
-                
-    except Exception as e:
-        # Final fallback: use simple distance from center
-        center_lat, center_lon = 53.5, -8.0
-        distance = ((lat - center_lat)**2 + (lon - center_lon)**2)**0.5
-        
-        if distance > 2.0:  # More than 2 degrees from center
-            return 'Offshore'
-        else:
-            return 'Onshore'
+        result = None
+    # If no clear data, fall back to simplified method
+    return result or determine_onshore_offshore_simple(lat, lon)
 
 def determine_onshore_offshore(lat, lon):
     """Determine if a location is onshore or offshore based on coordinates."""
-    # Try OSM-based detection first, fall back to simple method
+    # Local land polygon first (offline), then OSM, then the simple method
+    labels = classify_onshore_offshore([lat], [lon])
+    if labels is not None:
+        return str(labels[0])
     return determine_onshore_offshore_osm(lat, lon)
 
+ERA5_DIR = os.path.join(PROJECT_ROOT, "data", "era5")
+HISTORICAL_YEARS = list(range(1994, 2020))  # 1994-2019
+
+@lru_cache(maxsize=1)
+def _load_wind_stack():
+    """
+    Load every yearly ERA5 file once into a (year, lat, lon) float32 cube of
+    annual mean wind speed, with its lat/lon axes (lon in -180..180).
+    Returns None if no yearly file is readable.
+    """
+    import xarray as xr
+    
+    layers, grid_lat, grid_lon = [], None, None
+    for year in HISTORICAL_YEARS:
+        year_file = os.path.join(ERA5_DIR, f"era5_ireland_wind_{year}.nc")
+        if not os.path.exists(year_file):
+            continue
+        try:
+            with xr.open_dataset(year_file) as ds:
+                da = ds['u10'] if 'u10' in ds else ds[list(ds.data_vars)[0]]
+                da = da.rename({k: v for k, v in {'lat': 'latitude', 'lon': 'longitude'}.items() if k in da.dims})
+                if 'time' in da.dims:
+                    da = da.mean('time')
+                da = da.transpose('latitude', 'longitude')
+                lat = da.latitude.values.astype(float)
+                lon = da.longitude.values.astype(float)
+                lon = lon - 360.0 * (lon > 180)
+                if not all(len(a) < 3 or np.allclose(np.diff(a), a[1] - a[0]) for a in (lat, lon)):
+                    continue  # Nearest lookup below assumes a regular grid
+                if grid_lat is None:
+                    grid_lat, grid_lon = lat, lon
+                elif not (np.array_equal(lat, grid_lat) and np.array_equal(lon, grid_lon)):
+                    continue  # Different grid, can't stack
+                layers.append(da.values.astype(np.float32))
+        except (OSError, KeyError, ValueError):
+            continue  # Unreadable file or unexpected layout: skip this year
+    
+    if not layers:
+        return None
+    return np.stack(layers), grid_lat, grid_lon
+
+def _nearest_index(axis, values):
+    """
+    Nearest-gridpoint indices on a regular 1-D axis by direct arithmetic
+    (O(1) per point, no argmin scan). Points off the grid snap to the edge.
+    """
+    step = axis[1] - axis[0] if len(axis) > 1 else 1.0
+    idx = np.rint((np.asarray(values, dtype=float) - axis[0]) / step)
+    return np.clip(idx, 0, len(axis) - 1).astype(np.intp)
+
+def historical_wind_at(lats, lons):
+    """
+    Yearly wind speeds at the nearest ERA5 grid point of every (lat, lon),
+    as an (n_points, n_years) float32 array in one gather. None if no yearly
+    data is available.
+    """
+    stack = _load_wind_stack()
+    if stack is None:
+        return None
+    cube, grid_lat, grid_lon = stack
+    lat_idx = _nearest_index(grid_lat, np.atleast_1d(lats))
+    lon_idx = _nearest_index(grid_lon, np.atleast_1d(lons))
+    return cube[:, lat_idx, lon_idx].T
+
+@lru_cache(maxsize=1)
+def _mean_wind_tree():
+    """
+    KD-tree over the mean wind CSV grid (lon in -180..180) and the matching
+    wind speeds, built once. None if the CSV is missing.
+    """
+    from scipy.spatial import cKDTree
+    
+    wind_data_path = os.path.join(ERA5_DIR, "era5_ireland_mean_wind_1994_2024.csv")
+    if not os.path.exists(wind_data_path):
+        return None
+    wind_data = pd.read_csv(wind_data_path)
+    lon = wind_data['longitude'].to_numpy(dtype=float)
+    points = np.column_stack([wind_data['latitude'].to_numpy(dtype=float), lon - 360.0 * (lon > 180)])
+    return cKDTree(points), wind_data['wind_speed_10m'].to_numpy()
+
+def _mean_wind_at(lats, lons):
+    """Mean wind speed at the nearest CSV grid point for each (lat, lon), or None."""
+    tree = _mean_wind_tree()
+    if tree is None:
+        return None
+    tree, speeds = tree
+    _, idx = tree.query(np.column_stack([np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)]), k=1)
+    return speeds[idx]
+
 def get_wind_speed_at_location_historical(lat, lon):
     """Get historical wind speed data for a specific location across all years."""
     try:
-        import os
-        import pandas as pd
-        import numpy as np
-        
-        PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
-        PROJECT_ROOT = os.path.join(PROJECT_ROOT, "..", "..")
-        
-        # Try to load individual year files for more detailed analysis
+        # Yearly values at the nearest grid point of the pre-stacked cube
         wind_speeds = []
-        years = list(range(1994, 2020))  # 1994-2019
-        
-        for year in years:
-            year_file = os.path.join(PROJECT_ROOT, "data", "era5", f"era5_ireland_wind_{year}.nc")
-            if os.path.exists(year_file):
-                try:
-                    # Load NetCDF file
-                    import xarray as xr
-                    ds = xr.open_dataset(year_file)
-                    
-                    # Find nearest grid point
-                    lat_idx = np.argmin(np.abs(ds.latitude - lat))
-                    lon_idx = np.argmin(np.abs(ds.longitude - lon))
-                    
-                    # Get wind speed data for this year
-                    wind_speed = ds.u10.isel(latitude=lat_idx, longitude=lon_idx).values
-                    if not np.isnan(wind_speed):
-                        wind_speeds.append(float(wind_speed))
-                    
-                    ds.close()
-                    
-                except Exception as e:
-                    continue
+        values = historical_wind_at(lat, lon)
+        if values is not None:
+            wind_speeds = [float(v) for v in values[0] if not np.isnan(v)]
         
         # If no individual year data, fall back to mean data
         if not wind_speeds:
-            wind_data_path = os.path.join(PROJECT_ROOT, "data", "era5", "era5_ireland_mean_wind_1994_2024.csv")
-            
-            if os.path.exists(wind_data_path):
-                wind_data = pd.read_csv(wind_data_path)
-                
-                # Convert longitude from 0-360 to -180-180 if needed
-                if 'longitude' in wind_data.columns:
-                    wind_data['longitude'] = wind_data['longitude'].apply(lambda x: x - 360 if x > 180 else x)
-                
-                # Find nearest data point
-                distances = np.sqrt((wind_data['latitude'] - lat)**2 + (wind_data['longitude'] - lon)**2)
-                nearest_idx = distances.idxmin()
-                
-                # Get wind speed for this location
-                wind_speed = wind_data.loc[nearest_idx, 'wind_speed_10m']
-                wind_speeds = [wind_speed]
+            mean_wind = _mean_wind_at([lat], [lon])
+            if mean_wind is not None:
+                wind_speeds = [mean_wind[0]]
         
         return wind_speeds if wind_speeds else None
         
@@ -729,28 +1032,78 @@ def get_wind_speed_at_location_historical(lat, lon):
 def get_historical_wind_speeds_for_zones(zones_gdf):
     """Get historical wind speed data for all optimal zones."""
     try:
-        all_wind_data = []
+        lats = zones_gdf['latitude'].to_numpy(dtype=float)
+        lons = zones_gdf['longitude'].to_numpy(dtype=float)
+        
+        # (zone, year) values gathered from the cube in one indexing call
+        values = historical_wind_at(lats, lons)
+        if values is None:
+            values = np.empty((len(lats), 0), dtype=np.float32)
+        has_data = ~np.isnan(values).all(axis=1)
+        if has_data.all():
+            return values[~np.isnan(values)].tolist()
+        
+        # Zones without yearly data fall back to the mean wind CSV (one bulk query)
+        fallback = np.full(len(lats), np.nan)
+        mean_wind = _mean_wind_at(lats[~has_data], lons[~has_data])
+        if mean_wind is not None:
+            fallback[~has_data] = mean_wind
         
-        for _, zone in zones_gdf.iterrows():
-            lat, lon = zone['latitude'], zone['longitude']
-            zone_wind_data = get_wind_speed_at_location_historical(lat, lon)
-            if zone_wind_data is not None:
-                all_wind_data.extend(zone_wind_data)
+        all_wind_data = []
+        for row, ok, mean in zip(values, has_data, fallback):
+            if ok:
+                all_wind_data.extend(row[~np.isnan(row)].tolist())
+            elif not np.isnan(mean):
+                all_wind_data.append(mean)
         
         return all_wind_data
         
     except Exception as e:
         return None
 
+@st.cache_data(show_spinner=False)
+def load_mean_wind_ireland(path, mtime):
+    """
+    Mean wind CSV with longitudes in -180..180, filtered to Ireland bounds.
+    Shared by the mean wind and variability layers; `mtime` keys the cache.
+    """
+    df_mean = pd.read_csv(path)
+    
+    # Convert longitude from 0-360 to -180-180 if needed
+    if 'longitude' in df_mean.columns:
+        lon = df_mean['longitude'].to_numpy()
+        df_mean['longitude'] = lon - 360.0 * (lon > 180)
+    
+    # Filter data for Ireland bounds
+    return df_mean[
+        df_mean['latitude'].between(51.0, 55.5) & df_mean['longitude'].between(-11.0, -5.0)
+    ]
+
+@st.cache_data(show_spinner=False)
+def mean_wind_heat_data(path, mtime):
+    """
+    [lat, lon, intensity] rows for the wind heatmaps as an (N, 3) array, the
+    intensity being the mean wind speed scaled to 0-1. Built once per file
+    version and shared by the mean wind and variability layers.
+    """
+    df_mean = load_mean_wind_ireland(path, mtime)
+    valid = df_mean[df_mean['wind_speed_10m'].notna()]
+    speeds = valid['wind_speed_10m'].to_numpy(dtype=float)
+    if len(speeds) == 0:
+        return np.empty((0, 3))
+    
+    # Normalize wind speed for better visualization
+    min_wind, max_wind = speeds.min(), speeds.max()
+    intensity = (speeds - min_wind) / (max_wind - min_wind) if max_wind > min_wind else np.full(len(speeds), 0.5)
+    return np.column_stack([
+        valid['latitude'].to_numpy(dtype=float),
+        valid['longitude'].to_numpy(dtype=float),
+        intensity.round(HEAT_INTENSITY_DECIMALS)
+    ]).round(LAYER_DECIMALS['lat'])
+
 def add_wind_data_layers(m, show_layers, wind_opacity=0.6, wind_radius=25, wind_blur=15):
     """Add wind data layers (mean wind speed and standard deviation) to the map."""
     try:
-        from folium import plugins
-        import folium
-        import pandas as pd
-        import os
-        import numpy as np
-        
         # Load wind data
         PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
         PROJECT_ROOT = os.path.join(PROJECT_ROOT, "..", "..")
@@ -760,30 +1113,10 @@ def add_wind_data_layers(m, show_layers, wind_opacity=0.6, wind_radius=25, wind_
             mean_wind_path = os.path.join(PROJECT_ROOT, "data", "era5", "era5_ireland_mean_wind_1994_2024.csv")
             if os.path.exists(mean_wind_path):
                 try:
-                    df_mean = pd.read_csv(mean_wind_path)
-                    
-                    # Convert longitude from 0-360 to -180-180 if needed
-                    if 'longitude' in df_mean.columns:
-                        df_mean['longitude'] = df_mean['longitude'].apply(lambda x: x - 360 if x > 180 else x)
-                    
-                    # Filter data for Ireland bounds
-                    df_mean = df_mean[
-                        (df_mean['latitude'] >= 51.0) & (df_mean['latitude'] <= 55.5) &
-                        (df_mean['longitude'] >= -11.0) & (df_mean['longitude'] <= -5.0)
-                    ]
-                    
                     # Create heatmap data with normalized values
-                    wind_speeds = df_mean['wind_speed_10m'].dropna()
-                    if len(wind_speeds) > 0:
-                        min_wind = wind_speeds.min()
-                        max_wind = wind_speeds.max()
-                        
-                        mean_wind_data = []
-                        for _, row in df_mean.iterrows():
-                            if not pd.isna(row['wind_speed_10m']):
-                                # Normalize wind speed for better visualization
-                                normalized_speed = (row['wind_speed_10m'] - min_wind) / (max_wind - min_wind) if max_wind > min_wind else 0.5
-                                mean_wind_data.append([row['latitude'], row['longitude'], normalized_speed])
+                    heat_data = mean_wind_heat_data(mean_wind_path, os.path.getmtime(mean_wind_path))
+                    if len(heat_data) > 0:
+                        mean_wind_data = heat_data.tolist()
                         
                         # Add mean wind speed heatmap with improved styling for better resolution
                         # Use a more sophisticated approach with better rendering
@@ -807,33 +1140,6 @@ def add_wind_data_layers(m, show_layers, wind_opacity=0.6, wind_radius=25, wind_
                         )
                         wind_heatmap.add_to(m)
                         
-                        # Add a more detailed wind speed layer using circles for better resolution
-                        for i, (lat, lon, intensity) in enumerate(mean_wind_data[:100]):  # Limit to first 100 points for performance
-                            # Convert normalized intensity back to wind speed for display
-                            actual_wind_speed = min_wind + intensity * (max_wind - min_wind)
-                            
-                            # Color based on wind speed
-                            if actual_wind_speed < 6:
-                                color = '#0000FF'  # Blue
-                            elif actual_wind_speed < 8:
-                                color = '#0080FF'  # Light blue
-                            elif actual_wind_speed < 10:
-                                color = '#00FFFF'  # Cyan
-                            elif actual_wind_speed < 12:
-                                color = '#FFFF00'  # Yellow
-                            else:
-                                color = '#FF0000'  # Red
-                            
-                            # Add circle marker for better resolution
-                            folium.CircleMarker(
-                                location=[lat, lon],
-                                radius=3,
-                                color=color,
-                                fill=True,
-                                fillOpacity=0.6,
-                                popup=f"Wind Speed: {actual_wind_speed:.1f} m/s"
-                            ).add_to(m)
-                        
                         st.success(f"✅ Mean wind speed layer loaded: {len(mean_wind_data)} data points")
                     else:
                         st.warning("No valid wind speed data found")
@@ -853,29 +1159,12 @@ def add_wind_data_layers(m, show_layers, wind_opacity=0.6, wind_radius=25, wind_
                 mean_wind_path = os.path.join(PROJECT_ROOT, "data", "era5", "era5_ireland_mean_wind_1994_2024.csv")
                 if os.path.exists(mean_wind_path):
                     try:
-                        df_mean = pd.read_csv(mean_wind_path)
-                        if 'longitude' in df_mean.columns:
-                            df_mean['longitude'] = df_mean['longitude'].apply(lambda x: x - 360 if x > 180 else x)
-                        
-                        # Filter data for Ireland bounds
-                        df_mean = df_mean[
-                            (df_mean['latitude'] >= 51.0) & (df_mean['latitude'] <= 55.5) &
-                            (df_mean['longitude'] >= -11.0) & (df_mean['longitude'] <= -5.0)
-                        ]
-                        
                         # Create variability data (simplified - in reality you'd use actual std dev)
-                        # Use wind speed as a proxy for variability (higher wind = more variable)
-                        wind_speeds = df_mean['wind_speed_10m'].dropna()
-                        if len(wind_speeds) > 0:
-                            min_wind = wind_speeds.min()
-                            max_wind = wind_speeds.max()
-                            
-                            variability_data = []
-                            for _, row in df_mean.iterrows():
-                                if not pd.isna(row['wind_speed_10m']):
-                                    # Create variability proxy (higher wind speed = more variable)
-                                    variability_proxy = (row['wind_speed_10m'] - min_wind) / (max_wind - min_wind) if max_wind > min_wind else 0.5
-                                    variability_data.append([row['latitude'], row['longitude'], variability_proxy])
+                        # Use wind speed as a proxy for variability (higher wind = more variable),
+                        # i.e. the same normalized intensities as the mean wind layer
+                        heat_data = mean_wind_heat_data(mean_wind_path, os.path.getmtime(mean_wind_path))
+                        if len(heat_data) > 0:
+                            variability_data = heat_data.tolist()
                             
                             # Add wind variability heatmap with improved styling for better resolution
                             variability_heatmap = plugins.HeatMap(
@@ -897,30 +1186,6 @@ def add_wind_data_layers(m, show_layers, wind_opacity=0.6, wind_radius=25, wind_
                             )
                             variability_heatmap.add_to(m)
                             
-                            # Add detailed variability markers for better resolution
-                            for i, (lat, lon, intensity) in enumerate(variability_data[:100]):  # Limit to first 100 points for performance
-                                # Color based on variability
-                                if intensity < 0.3:
-                                    color = '#00FF00'  # Green - Low variability
-                                elif intensity < 0.5:
-                                    color = '#80FF00'  # Light green
-                                elif intensity < 0.7:
-                                    color = '#FFFF00'  # Yellow
-                                elif intensity < 0.9:
-                                    color = '#FF8000'  # Orange
-                                else:
-                                    color = '#FF0000'  # Red - High variability
-                                
-                                # Add circle marker for better resolution
-                                folium.CircleMarker(
-                                    location=[lat, lon],
-                                    radius=3,
-                                    color=color,
-                                    fill=True,
-                                    fillOpacity=0.6,
-                                    popup=f"Variability: {intensity:.2f}"
-                                ).add_to(m)
-                            
                             st.success(f"✅ Wind variability layer loaded: {len(variability_data)} data points")
                         else:
                             st.warning("No valid wind data for variability calculation")
@@ -937,12 +1202,68 @@ def add_wind_data_layers(m, show_layers, wind_opacity=0.6, wind_radius=25, wind_
     except Exception as e:
         st.warning(f"Could not load wind data layers: {e}")
 
+def safe_point_coords(geoms):
+    """
+    [lat, lon] of every geometry as an (N, 2) array: the point itself for
+    Points, the centroid otherwise, NaN rows for missing/empty geometries.
+    """
+    geoms = np.asarray(geoms, dtype=object)
+    coords = np.full((len(geoms), 2), np.nan)
+    valid = ~(shapely.is_missing(geoms) | shapely.is_empty(geoms))
+    # The centroid of a Point is the point itself
+    centroids = shapely.centroid(geoms[valid])
+    coords[valid, 0] = shapely.get_y(centroids)
+    coords[valid, 1] = shapely.get_x(centroids)
+    return coords
+
+def substations_layer(coords):
+    """
+    All substations as one GeoJson layer of small red circle markers
+    (`coords` is an (N, 2) [lat, lon] array without missing rows).
+    """
+    import geopandas as gpd
+    
+    points = gpd.GeoSeries(gpd.points_from_xy(coords[:, 1], coords[:, 0]), crs=4326)
+    return folium.GeoJson(
+        points.to_json(),
+        name="Substations",
+        marker=folium.CircleMarker(radius=3, fill=True),
+        style_function=lambda f: {"color": "#D7263D", "fillColor": "#D7263D"},
+    )
+
+def transmission_lines_geojson(lines):
+    """Simplified line geometries as a GeoJSON string (attributes are not drawn)."""
+    return lines.geometry.simplify(LINE_SIMPLIFY_TOLERANCE, preserve_topology=True).to_json()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_infrastructure_layer(path, mtime, columns=None):
+    """
+    Load an infrastructure layer in EPSG:4326, clipped to Ireland.
+    `mtime` keys the Streamlit cache so an updated file is re-read; cold loads
+    go through the GeoParquet copy kept next to the source file.
+    """
+    from src.utils.vector_cache import read_file_cached
+    
+    gdf = read_file_cached(path, crs="EPSG:4326")
+    gdf = gdf.cx[-11.0:-5.0, 51.0:55.5]
+    if columns is not None:
+        gdf = gdf[[*columns, gdf.geometry.name]]
+    return gdf[gdf.geometry.notnull()].copy()
+
+# Builds one wind farm marker per FastMarkerCluster row: [lat, lon, popup_html]
+WIND_FARM_MARKER_CALLBACK = """
+    function (row) {
+        var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+            radius: 6, color: "#009E73", fill: true, fillOpacity: 0.8
+        });
+        marker.bindPopup(row[2], {maxWidth: 300});
+        return marker;
+    }
+"""
+
 def add_infrastructure_to_map(m):
     """Add transmission infrastructure to the map (same as first page)."""
-    import os
     import geopandas as gpd
-    import json
-    import pandas as pd
     
     # Load infrastructure data (same paths as first page)
     PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -952,64 +1273,50 @@ def add_infrastructure_to_map(m):
     SUBS_PATH = os.path.join(PROJECT_ROOT, "data", "osm", "substations_110kV_clean.geojson")
     WIND_PATH = os.path.join(PROJECT_ROOT, "data", "wind_farms", "Wind Farms June 2022_ESPG3857.shp")
     
-    def load_layer(path):
+    def load_layer(path, columns=None):
         if not os.path.exists(path):
             return gpd.GeoDataFrame()
-        gdf = gpd.read_file(path)
-        if gdf.crs and gdf.crs.to_string() != "EPSG:4326":
-            gdf = gdf.to_crs("EPSG:4326")
-        return gdf[gdf.geometry.notnull()].copy()
-    
-    def safe_point_coords(g):
-        if g is None or g.is_empty:
-            return None
-        if g.geom_type == "Point":
-            return [g.y, g.x]
-        return [g.centroid.y, g.centroid.x]
-    
-    # Load data
-    lines = load_layer(LINES_PATH)
-    subs = load_layer(SUBS_PATH)
+        return load_infrastructure_layer(path, os.path.getmtime(path), columns)
+    
+    # Load data (lines and substations only need their geometry)
+    lines = load_layer(LINES_PATH, columns=())
+    subs = load_layer(SUBS_PATH, columns=())
     wind = load_layer(WIND_PATH)
     
     if not lines.empty:
-        subs["coords"] = subs.geometry.apply(safe_point_coords)
-        wind["coords"] = wind.geometry.apply(safe_point_coords)
+        # [lat, lon] per feature in one vectorized pass; drop rows without a location
+        sub_coords = safe_point_coords(subs.geometry)
+        sub_coords = sub_coords[~np.isnan(sub_coords).any(axis=1)].round(LAYER_DECIMALS['lat'])
+        wind_coords = safe_point_coords(wind.geometry) if not wind.empty else np.empty((0, 2))
+        has_coords = ~np.isnan(wind_coords).any(axis=1)
+        # The popups read only attributes, so carry a plain frame without geometries
+        wind = pd.DataFrame(wind[has_coords].drop(columns='geometry', errors='ignore'))
+        wind["coords"] = wind_coords[has_coords].round(LAYER_DECIMALS['lat']).tolist()
         
         # Add transmission lines
-        for col in lines.select_dtypes(include=["datetime64[ns]"]).columns:
-            lines[col] = lines[col].astype(str)
-        lines_geojson = json.loads(lines[["geometry"]].to_json())
         folium.GeoJson(
-            lines_geojson,
+            transmission_lines_geojson(lines),
             name="Transmission Lines",
             style_function=lambda x: {"color": "#007BFF", "weight": 2, "opacity": 0.7},
         ).add_to(m)
         
         # Add substations
-        for _, row in subs.iterrows():
-            if row["coords"]:
-                folium.CircleMarker(location=row["coords"], radius=3, color="#D7263D", fill=True).add_to(m)
+        substations_layer(sub_coords).add_to(m)
         
         # Add existing wind farms with enhanced tooltips (only if wind farms exist)
         if not wind.empty:
-            for _, row in wind.iterrows():
-                if row["coords"]:
-                    # Extract wind farm information
-                    wind_farm_name = extract_wind_farm_name(row)
-                    wind_farm_capacity = extract_wind_farm_capacity(row)
-                    
-                    # Create enhanced popup
-                    popup_html = create_wind_farm_popup(wind_farm_name, wind_farm_capacity, row)
-                    
-                    folium.CircleMarker(
-                        location=row["coords"], 
-                        radius=6, 
-                        color="#009E73", 
-                        fill=True,
-                        fillOpacity=0.8,
-                        popup=folium.Popup(popup_html, max_width=300)
-                    ).add_to(m)
+            # Extract wind farm information and build the popups for all rows at once
+            popups = wind_farm_popups(wind, wind_farm_names(wind), wind_farm_capacities(wind))
+            wind_markers = [
+                [*coords, popup_html] for coords, popup_html in zip(wind["coords"], popups)
+            ]
+
+            # Markers are created in the browser from one data array and clustered
+            plugins.FastMarkerCluster(
+                wind_markers,
+                callback=WIND_FARM_MARKER_CALLBACK,
+                name="Existing Wind Farms"
+            ).add_to(m)
     
     # Add layer control
     folium.LayerControl().add_to(m)
@@ -1019,20 +1326,114 @@ def add_infrastructure_to_map(m):
 # ============================================================
 # STREAMLIT INTEGRATION
 # ============================================================
-def render_optimal_zones_map():
-    """Render optimal zones map in Streamlit."""
+@st.cache_data(show_spinner="🔄 Calculating optimal zones...", ttl=3600, max_entries=16)
+def _cached_optimal_zones(grid_resolution, min_wind_speed, max_grid_distance, weights_items, wind_farm_type):
+    """
+    calculate_optimal_zones_with_progress memoized per parameter set
+    (`weights_items` is the weights dict as a sorted tuple so it hashes),
+    so re-running with a previous configuration or preset is instant.
+    """
+    return calculate_optimal_zones_with_progress(
+        grid_resolution=grid_resolution,
+        min_wind_speed=min_wind_speed,
+        max_grid_distance=max_grid_distance,
+        weights=dict(weights_items),
+        wind_farm_type=wind_farm_type
+    )
+
+def zones_frame_key(zones_gdf):
+    """
+    Order-sensitive content hash of every zone column (the geometry is
+    derived from latitude/longitude and left out), without stringifying the frame.
+    """
+    row_hashes = pd.util.hash_pandas_object(zones_gdf.drop(columns='geometry', errors='ignore'), index=False)
+    return hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=8).hexdigest()
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _zones_csv(frame_key, _zones_gdf):
+    """
+    The zones as CSV bytes for the download button (cached per `frame_key`),
+    with the display columns rounded to ZONE_DISPLAY_DECIMALS.
+    """
+    return _zones_gdf.round(ZONE_DISPLAY_DECIMALS).to_csv(index=False).encode()
+
+# Fixed bin count for the wind speed histograms
+WIND_HISTOGRAM_BINS = 20
+
+def _wind_speed_histogram(wind_speeds):
+    """Fixed-bin histogram of wind speeds as a chart frame (bin centers and counts)."""
+    counts, edges = np.histogram(wind_speeds, bins=WIND_HISTOGRAM_BINS)
+    centers = (0.5 * (edges[:-1] + edges[1:])).round(2)
+    return pd.DataFrame({'Wind Speed (m/s)': centers, 'Count': counts})
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _prerendered_optimal_zones_map(map_key, layer_flags, wind_style, _zones_gdf, _cluster_stats):
+    """
+    Build the optimal zones Folium map and render its HTML once.
+    Cached per map key, layer toggles and wind styling (`wind_style` is
+    only part of the key; create_folium_optimal_zones_map reads it from
+    session state), so reruns reuse the rendered map.
+    """
+    show_layers = dict(layer_flags)
     
-    st.title("🎯 Optimal Wind Farm Zones")
-    st.markdown("Interactive visualization of optimal wind farm development areas in Ireland.")
+    # Always use Folium for consistency with first page
+    m = create_folium_optimal_zones_map(_zones_gdf, _cluster_stats, show_layers)
     
-    # ======================================================
-    # 🎛️ SELECTION CRITERIA CONTROLS
-    # ======================================================
-    st.sidebar.header("🎛️ Selection Criteria")
+    # Add transmission infrastructure like the first page
+    m = add_infrastructure_to_map(m)
+    
+    # Add layer control for wind data layers
+    if show_layers.get('mean_wind_speed', False) or show_layers.get('wind_standard_deviation', False):
+        layer_control = folium.LayerControl(position='topright', collapsed=False)
+        layer_control.add_to(m)
+    
+    m.get_root().render()
+    return m
+
+def _render_criteria(wind_farm_type, min_wind_speed, max_grid_distance,
+                     wind_weight, grid_weight, env_weight, grid_resolution):
+    """The "Current Selection Criteria" metrics panel."""
+    st.subheader("📋 Current Selection Criteria")
+    
+    criteria_col1, criteria_col2, criteria_col3 = st.columns(3)
+    
+    criteria_col1.metric("Wind Farm Type", wind_farm_type)
+    criteria_col1.metric("Min Wind Speed", f"{min_wind_speed:.1f} m/s")
+    criteria_col1.metric("Max Grid Distance", f"{max_grid_distance} km")
+    
+    criteria_col2.metric("Wind Weight", f"{wind_weight:.1%}")
+    criteria_col2.metric("Grid Weight", f"{grid_weight:.1%}")
+    
+    criteria_col3.metric("Environmental Weight", f"{env_weight:.1%}")
+    criteria_col3.metric("Grid Resolution", f"{grid_resolution}°")
+
+def _render_wind_layer_status(show_mean_wind, show_wind_std, wind_opacity, wind_radius, status):
+    """Wind data layer panel; `status` reads e.g. "active" or "will be active"."""
+    st.subheader("🌬️ Wind Data Layers")
+    wind_info_col1, wind_info_col2 = st.columns(2)
+    
+    if show_mean_wind:
+        wind_info_col1.success(f"✅ Mean Wind Speed layer {status}")
+    if show_wind_std:
+        wind_info_col1.success(f"✅ Wind Variability layer {status}")
+    
+    wind_info_col2.metric("Layer Opacity", f"{wind_opacity:.1f}")
+    wind_info_col2.metric("Layer Radius", f"{wind_radius}px")
+
+@st.fragment
+def _analysis_controls():
+    """
+    Sidebar widgets for the analysis parameters, run as a fragment so that
+    tweaking them reruns only this block until "Run Analysis" is clicked.
+    The values reach the page through st.session_state.analysis_params;
+    before the first analysis the page just echoes them, so a change then
+    reruns the whole app.
+    """
+    st.header("🎛️ Selection Criteria")
     
     # Wind farm type selection
-    st.sidebar.subheader("🌊 Wind Farm Type")
-    wind_farm_type = st.sidebar.radio(
+    st.subheader("🌊 Wind Farm Type")
+    wind_farm_type = st.radio(
         "Select Wind Farm Type:",
         ["Onshore", "Offshore", "Auto-Detect"],
         index=2,
@@ -1040,11 +1441,11 @@ def render_optimal_zones_map():
     )
     
     # Wind resource criteria
-    st.sidebar.subheader("🌬️ Wind Resource")
+    st.subheader("🌬️ Wind Resource")
     
     # Adjust wind speed criteria based on type
     if wind_farm_type == "Offshore":
-        min_wind_speed = st.sidebar.slider(
+        min_wind_speed = st.slider(
             "Minimum Wind Speed (m/s)", 
             min_value=6.0, 
             max_value=15.0, 
@@ -1053,7 +1454,7 @@ def render_optimal_zones_map():
             help="Offshore wind farms typically require higher wind speeds"
         )
     else:  # Onshore
-        min_wind_speed = st.sidebar.slider(
+        min_wind_speed = st.slider(
             "Minimum Wind Speed (m/s)", 
             min_value=5.0, 
             max_value=12.0, 
@@ -1063,11 +1464,11 @@ def render_optimal_zones_map():
         )
     
     # Grid connectivity criteria
-    st.sidebar.subheader("🏗️ Grid Connectivity")
+    st.subheader("🏗️ Grid Connectivity")
     
     # Adjust grid distance criteria based on type
     if wind_farm_type == "Offshore":
-        max_grid_distance = st.sidebar.slider(
+        max_grid_distance = st.slider(
             "Maximum Distance to Shore (km)", 
             min_value=5, 
             max_value=50, 
@@ -1076,7 +1477,7 @@ def render_optimal_zones_map():
             help="Offshore wind farms are typically closer to shore for grid connection"
         )
     else:  # Onshore
-        max_grid_distance = st.sidebar.slider(
+        max_grid_distance = st.slider(
             "Maximum Grid Distance (km)", 
             min_value=10, 
             max_value=100, 
@@ -1086,10 +1487,10 @@ def render_optimal_zones_map():
         )
     
     # Scoring weights (normalized to sum to 1)
-    st.sidebar.subheader("⚖️ Scoring Weights")
+    st.subheader("⚖️ Scoring Weights")
     
     # Use number inputs with automatic normalization and session state
-    wind_input = st.sidebar.number_input(
+    wind_input = st.number_input(
         "Wind Resource Weight", 
         min_value=0.0, 
         max_value=1.0, 
@@ -1097,7 +1498,7 @@ def render_optimal_zones_map():
         step=0.1,
         help="Importance of wind resource in scoring"
     )
-    grid_input = st.sidebar.number_input(
+    grid_input = st.number_input(
         "Grid Connectivity Weight", 
         min_value=0.0, 
         max_value=1.0, 
@@ -1105,7 +1506,7 @@ def render_optimal_zones_map():
         step=0.1,
         help="Importance of grid connectivity in scoring"
     )
-    env_input = st.sidebar.number_input(
+    env_input = st.number_input(
         "Environmental Weight", 
         min_value=0.0, 
         max_value=1.0, 
@@ -1131,17 +1532,17 @@ def render_optimal_zones_map():
         env_weight = 0.2
     
     # Display normalized weights
-    st.sidebar.markdown(f"**Normalized Weights:**")
-    st.sidebar.markdown(f"Wind: {wind_weight:.1%}")
-    st.sidebar.markdown(f"Grid: {grid_weight:.1%}")
-    st.sidebar.markdown(f"Environmental: {env_weight:.1%}")
+    st.markdown(f"**Normalized Weights:**")
+    st.markdown(f"Wind: {wind_weight:.1%}")
+    st.markdown(f"Grid: {grid_weight:.1%}")
+    st.markdown(f"Environmental: {env_weight:.1%}")
     
     # Analysis parameters
-    st.sidebar.subheader("📊 Analysis Parameters")
+    st.subheader("📊 Analysis Parameters")
     
     # Adjust grid resolution based on type
     if wind_farm_type == "Offshore":
-        grid_resolution = st.sidebar.selectbox(
+        grid_resolution = st.selectbox(
             "Grid Resolution", 
             options=[0.05, 0.1, 0.15, 0.2], 
             index=1,
@@ -1149,7 +1550,7 @@ def render_optimal_zones_map():
             help="Offshore analysis can use finer resolution"
         )
     else:  # Onshore
-        grid_resolution = st.sidebar.selectbox(
+        grid_resolution = st.selectbox(
             "Grid Resolution", 
             options=[0.1, 0.15, 0.2, 0.25], 
             index=0,
@@ -1158,7 +1559,7 @@ def render_optimal_zones_map():
         )
     
     # Quick calculation option
-    quick_calc = st.sidebar.checkbox(
+    quick_calc = st.checkbox(
         "⚡ Quick Calculation", 
         value=False,
         help="Use faster calculation with reduced grid resolution"
@@ -1167,6 +1568,44 @@ def render_optimal_zones_map():
     if quick_calc:
         grid_resolution = 0.2  # Use coarser grid for faster calculation
     
+    params = {
+        'wind_farm_type': wind_farm_type,
+        'min_wind_speed': min_wind_speed,
+        'max_grid_distance': max_grid_distance,
+        'wind_weight': wind_weight,
+        'grid_weight': grid_weight,
+        'env_weight': env_weight,
+        'grid_resolution': grid_resolution
+    }
+    previous = st.session_state.get('analysis_params')
+    st.session_state.analysis_params = params
+    if previous is not None and previous != params and 'optimal_zones' not in st.session_state:
+        # Before the first analysis the main area only echoes these values
+        # (criteria panel), which a fragment cannot write to, so rerun the
+        # whole app; once results exist the fragment-only rerun is kept
+        st.rerun(scope="app")
+
+def render_optimal_zones_map():
+    """Render optimal zones map in Streamlit."""
+    
+    st.title("🎯 Optimal Wind Farm Zones")
+    st.markdown("Interactive visualization of optimal wind farm development areas in Ireland.")
+    
+    # ======================================================
+    # 🎛️ SELECTION CRITERIA CONTROLS
+    # ======================================================
+    with st.sidebar:
+        _analysis_controls()
+    
+    params = st.session_state.analysis_params
+    wind_farm_type = params['wind_farm_type']
+    min_wind_speed = params['min_wind_speed']
+    max_grid_distance = params['max_grid_distance']
+    wind_weight = params['wind_weight']
+    grid_weight = params['grid_weight']
+    env_weight = params['env_weight']
+    grid_resolution = params['grid_resolution']
+    
     # Zone filtering
     st.sidebar.subheader("🔍 Zone Filtering")
     show_excellent = st.sidebar.checkbox("Excellent Zones", value=True)
@@ -1255,6 +1694,7 @@ def render_optimal_zones_map():
         st.sidebar.markdown("*Click 'Run Analysis' to start*")
     
     if clear_cache_btn:
+        _cached_optimal_zones.clear()
         if 'optimal_zones' in st.session_state:
             del st.session_state.optimal_zones
         if 'cluster_stats' in st.session_state:
@@ -1266,35 +1706,9 @@ def render_optimal_zones_map():
     # ======================================================
     # Only run calculation when explicitly requested
     if calculate_btn:
-        # Create progress containers
-        progress_container = st.container()
         status_container = st.container()
         
-        with progress_container:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            time_text = st.empty()
-        
         with status_container:
-            st.info("🔄 Starting optimal zones calculation...")
-            
-            from src.analysis.optimal_zones import calculate_optimal_zones_with_progress
-            import time
-            
-            start_time = time.time()
-            
-            def progress_callback(progress, message):
-                progress_bar.progress(progress)
-                status_text.text(message)
-                
-                # Estimate time remaining
-                elapsed = time.time() - start_time
-                if progress > 0.1:  # Only show estimate after 10% progress
-                    remaining = elapsed * (1 - progress) / progress
-                    time_text.text(f"⏱️ Estimated time remaining: {remaining:.0f}s")
-                else:
-                    time_text.text("⏱️ Calculating...")
-            
             # Handle auto-detection of wind farm type
             if wind_farm_type == "Auto-Detect":
                 st.info("🔍 Auto-detecting wind farm types based on location...")
@@ -1303,24 +1717,19 @@ def render_optimal_zones_map():
             else:
                 actual_wind_farm_type = wind_farm_type
             
-            # Update parameters with progress callback
-            zones_gdf, cluster_stats = calculate_optimal_zones_with_progress(
-                grid_resolution=grid_resolution,
-                min_wind_speed=min_wind_speed,
-                max_grid_distance=max_grid_distance,
-                weights={'wind': wind_weight, 'grid': grid_weight, 'environmental': env_weight},
-                wind_farm_type=actual_wind_farm_type,
-                progress_callback=progress_callback
+            # Cached per parameter set; a spinner shows while a new set is computed
+            weights = {'wind': wind_weight, 'grid': grid_weight, 'environmental': env_weight}
+            zones_gdf, cluster_stats = _cached_optimal_zones(
+                grid_resolution,
+                min_wind_speed,
+                max_grid_distance,
+                tuple(sorted(weights.items())),
+                actual_wind_farm_type
             )
             
             st.session_state.optimal_zones = zones_gdf
             st.session_state.cluster_stats = cluster_stats
             
-            # Clear progress indicators
-            progress_bar.empty()
-            status_text.empty()
-            time_text.empty()
-            
             st.success("✅ Optimal zones calculation complete!")
     else:
         # Check if we have cached results
@@ -1332,37 +1741,14 @@ def render_optimal_zones_map():
             st.info("🎯 **Ready to Analyze!** Click the 'Run Analysis' button to calculate optimal zones with your selected criteria.")
             
             # Show current criteria without running calculation
-            st.subheader("📋 Current Selection Criteria")
-            
-            criteria_col1, criteria_col2, criteria_col3 = st.columns(3)
-            
-            with criteria_col1:
-                st.metric("Wind Farm Type", wind_farm_type)
-                st.metric("Min Wind Speed", f"{min_wind_speed:.1f} m/s")
-                st.metric("Max Grid Distance", f"{max_grid_distance} km")
-            
-            with criteria_col2:
-                st.metric("Wind Weight", f"{wind_weight:.1%}")
-                st.metric("Grid Weight", f"{grid_weight:.1%}")
-            
-            with criteria_col3:
-                st.metric("Environmental Weight", f"{env_weight:.1%}")
-                st.metric("Grid Resolution", f"{grid_resolution}°")
+            _render_criteria(
+                wind_farm_type, min_wind_speed, max_grid_distance,
+                wind_weight, grid_weight, env_weight, grid_resolution
+            )
             
             # Show wind data layer status
             if show_mean_wind or show_wind_std:
-                st.subheader("🌬️ Wind Data Layers")
-                wind_info_col1, wind_info_col2 = st.columns(2)
-                
-                with wind_info_col1:
-                    if show_mean_wind:
-                        st.success("✅ Mean Wind Speed layer will be active")
-                    if show_wind_std:
-                        st.success("✅ Wind Variability layer will be active")
-                        
-                with wind_info_col2:
-                    st.metric("Layer Opacity", f"{wind_opacity:.1f}")
-                    st.metric("Layer Radius", f"{wind_radius}px")
+                _render_wind_layer_status(show_mean_wind, show_wind_std, wind_opacity, wind_radius, "will be active")
             
             st.stop()
     
@@ -1393,58 +1779,34 @@ def render_optimal_zones_map():
     # ======================================================
     # 📊 CURRENT CRITERIA DISPLAY
     # ======================================================
-    st.subheader("📋 Current Selection Criteria")
-
-    criteria_col1, criteria_col2, criteria_col3 = st.columns(3)
-
-    with criteria_col1:
-        st.metric("Wind Farm Type", wind_farm_type)
-        st.metric("Min Wind Speed", f"{min_wind_speed:.1f} m/s")
-        st.metric("Max Grid Distance", f"{max_grid_distance} km")
-
-        with criteria_col2:
-            st.metric("Wind Weight", f"{wind_weight:.1%}")
-            st.metric("Grid Weight", f"{grid_weight:.1%}")
-
-        with criteria_col3:
-            st.metric("Environmental Weight", f"{env_weight:.1%}")
-            st.metric("Grid Resolution", f"{grid_resolution}°")
+    _render_criteria(
+        wind_farm_type, min_wind_speed, max_grid_distance,
+        wind_weight, grid_weight, env_weight, grid_resolution
+    )
     
     # Wind data layer information
     if show_mean_wind or show_wind_std:
-        st.subheader("🌬️ Wind Data Layers")
-        wind_info_col1, wind_info_col2 = st.columns(2)
-        
-        with wind_info_col1:
-            if show_mean_wind:
-                st.success("✅ Mean Wind Speed layer active")
-            if show_wind_std:
-                st.success("✅ Wind Variability layer active")
-                
-        with wind_info_col2:
-            st.metric("Layer Opacity", f"{wind_opacity:.1f}")
-            st.metric("Layer Radius", f"{wind_radius}px")
+        _render_wind_layer_status(show_mean_wind, show_wind_std, wind_opacity, wind_radius, "active")
     
     # ======================================================
     # 🗺️ MAP VISUALIZATION (Same format as first page)
     # ======================================================
     st.subheader("🗺️ Optimal Zones Map")
     
-    # Always use Folium for consistency with first page
-    m = create_folium_optimal_zones_map(zones_gdf, cluster_stats, show_layers)
-    
-    # Add transmission infrastructure like the first page
-    m = add_infrastructure_to_map(m)
-    
-    # Add layer control for wind data layers
-    if show_layers.get('mean_wind_speed', False) or show_layers.get('wind_standard_deviation', False):
-        from folium import LayerControl
-        layer_control = LayerControl(position='topright', collapsed=False)
-        layer_control.add_to(m)
-    
     # Display the map with key to force refresh when analysis is run
-    map_key = f"optimal_zones_map_{len(zones_gdf)}_{hash(str(zones_gdf)) if len(zones_gdf) > 0 else 'empty'}"
-    st_folium(m, height=700, width="100%", key=map_key)
+    frame_key = zones_frame_key(zones_gdf)
+    map_key = f"optimal_zones_map_{len(zones_gdf)}_{frame_key if len(zones_gdf) > 0 else 'empty'}"
+    wind_style = (
+        st.session_state.get('wind_opacity', 0.6),
+        st.session_state.get('wind_radius', 25),
+        st.session_state.get('wind_blur', 15)
+    )
+    m = _prerendered_optimal_zones_map(
+        map_key, tuple(sorted(show_layers.items())), wind_style, zones_gdf, cluster_stats
+    )
+    # Nothing is read back from this map, so ask st_folium to return nothing;
+    # the HTML is already rendered (render=False skips doing it again)
+    st_folium(m, height=700, width="100%", key=map_key, returned_objects=[], render=False)
     
     # ======================================================
     # 📊 RESULTS SUMMARY
@@ -1500,98 +1862,81 @@ def render_optimal_zones_map():
         if 'wind_speed_mps' in zones_gdf.columns:
             # Overall wind speed distribution
             st.subheader("📊 Overall Wind Speed Distribution")
-            all_wind_speeds = zones_gdf['wind_speed_mps'].tolist()
+            all_wind_speeds = zones_gdf['wind_speed_mps']
             
-            if all_wind_speeds:
-                import pandas as pd
-                import numpy as np
-                
+            if len(all_wind_speeds) > 0:
                 # Create overall histogram
-                wind_df = pd.DataFrame({'Wind Speed (m/s)': all_wind_speeds})
-                chart_data = wind_df['Wind Speed (m/s)'].value_counts().sort_index().reset_index()
-                chart_data.columns = ['Wind Speed (m/s)', 'Count']
+                chart_data = _wind_speed_histogram(all_wind_speeds)
                 st.bar_chart(chart_data, x="Wind Speed (m/s)", y="Count")
                 st.caption("📊 **Overall Wind Speed Distribution** - Distribution of wind speeds across all optimal zones")
                 
-                # Overall statistics
+                # Overall statistics in one aggregation (population std, as np.std)
+                overall = all_wind_speeds.agg(['mean', 'max', 'min'])
+                overall['std'] = all_wind_speeds.std(ddof=0)
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
-                    st.metric("Overall Mean", f"{np.mean(all_wind_speeds):.1f} m/s")
+                    st.metric("Overall Mean", f"{overall['mean']:.1f} m/s")
                 with col2:
-                    st.metric("Overall Max", f"{np.max(all_wind_speeds):.1f} m/s")
+                    st.metric("Overall Max", f"{overall['max']:.1f} m/s")
                 with col3:
-                    st.metric("Overall Min", f"{np.min(all_wind_speeds):.1f} m/s")
+                    st.metric("Overall Min", f"{overall['min']:.1f} m/s")
                 with col4:
-                    st.metric("Overall Std Dev", f"{np.std(all_wind_speeds):.1f} m/s")
+                    st.metric("Overall Std Dev", f"{overall['std']:.1f} m/s")
             
             # Group by zone category and show wind speed distribution
             st.subheader("📈 Wind Speed by Zone Category")
-            for category in zones_gdf['zone_category'].unique():
-                category_zones = zones_gdf[zones_gdf['zone_category'] == category]
-                if len(category_zones) > 0:
-                    st.write(f"**{category} Zones** ({len(category_zones)} locations)")
-                    
-                    # Get wind speed data for this category
-                    category_wind_speeds = category_zones['wind_speed_mps'].tolist()
-                    
-                    if category_wind_speeds:
-                        import pandas as pd
-                        import numpy as np
-                        
-                        # Create a histogram of wind speeds for this category
-                        wind_df = pd.DataFrame({'Wind Speed (m/s)': category_wind_speeds})
-                        chart_data = wind_df['Wind Speed (m/s)'].value_counts().sort_index().reset_index()
-                        chart_data.columns = ['Wind Speed (m/s)', 'Count']
-                        
-                        # Create histogram with axis titles
-                        st.bar_chart(chart_data, x="Wind Speed (m/s)", y="Count")
-                        st.caption(f"📈 **{category} Zones Wind Speed Distribution** - Wind speed distribution for {category} zone category")
-                        
-                        # Show statistics
-                        col1, col2, col3, col4 = st.columns(4)
-                        with col1:
-                            st.metric("Mean Wind Speed", f"{np.mean(category_wind_speeds):.1f} m/s")
-                        with col2:
-                            st.metric("Max Wind Speed", f"{np.max(category_wind_speeds):.1f} m/s")
-                        with col3:
-                            st.metric("Min Wind Speed", f"{np.min(category_wind_speeds):.1f} m/s")
-                        with col4:
-                            st.metric("Std Deviation", f"{np.std(category_wind_speeds):.1f} m/s")
-                    else:
-                        st.info(f"No wind speed data available for {category} zones")
+            
+            # Per-category statistics for all categories at once, in order of appearance
+            by_category = zones_gdf.groupby('zone_category', sort=False)['wind_speed_mps']
+            category_stats = by_category.agg(['mean', 'max', 'min'])
+            category_stats['std'] = by_category.std(ddof=0)
+            
+            for category, category_wind_speeds in by_category:
+                stats = category_stats.loc[category]
+                st.write(f"**{category} Zones** ({len(category_wind_speeds)} locations)")
+                
+                # Create a histogram of wind speeds for this category
+                chart_data = _wind_speed_histogram(category_wind_speeds)
+                
+                # Create histogram with axis titles
+                st.bar_chart(chart_data, x="Wind Speed (m/s)", y="Count")
+                st.caption(f"📈 **{category} Zones Wind Speed Distribution** - Wind speed distribution for {category} zone category")
+                
+                # Show statistics
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Mean Wind Speed", f"{stats['mean']:.1f} m/s")
+                with col2:
+                    st.metric("Max Wind Speed", f"{stats['max']:.1f} m/s")
+                with col3:
+                    st.metric("Min Wind Speed", f"{stats['min']:.1f} m/s")
+                with col4:
+                    st.metric("Std Deviation", f"{stats['std']:.1f} m/s")
         else:
             st.info("Wind speed data not available in zones data")
         
         # Top zones table
         st.subheader("🏆 Top Optimal Zones")
-        top_zones = zones_gdf.nlargest(10, 'composite_score')[
-            ['latitude', 'longitude', 'zone_category', 'wind_speed_mps',
-             'grid_distance_km', 'grid_cost_eur', 'composite_score']
-        ]
         
-        # Add capacity factor if available
-        if 'capacity_factor' in zones_gdf.columns:
-            top_zones = zones_gdf.nlargest(10, 'composite_score')[
-                ['latitude', 'longitude', 'zone_category', 'wind_speed_mps',
-                 'capacity_factor', 'grid_distance_km', 'grid_cost_eur', 'composite_score']
-            ]
-            # Format capacity factor as percentage
-            top_zones['capacity_factor'] = (top_zones['capacity_factor'] * 100).round(1).astype(str) + '%'
-        elif 'capacity_factor_score' in zones_gdf.columns:
-            # Use capacity factor score if available
-            top_zones = zones_gdf.nlargest(10, 'composite_score')[
-                ['latitude', 'longitude', 'zone_category', 'wind_speed_mps',
-                 'capacity_factor_score', 'grid_distance_km', 'grid_cost_eur', 'composite_score']
-            ]
+        # Add capacity factor if available (or its score as a fallback)
+        cf_col = next((c for c in ['capacity_factor', 'capacity_factor_score'] if c in zones_gdf.columns), None)
+        top_cols = ['latitude', 'longitude', 'zone_category', 'wind_speed_mps']
+        if cf_col:
+            top_cols.append(cf_col)
+        top_cols += ['grid_distance_km', 'grid_cost_eur', 'composite_score']
+        
+        # Narrow to the table columns first so nlargest only copies those
+        top_zones = zones_gdf[top_cols].nlargest(10, 'composite_score')
+        if cf_col:
             # Rename for display and format as percentage
-            top_zones = top_zones.rename(columns={'capacity_factor_score': 'capacity_factor'})
+            top_zones = top_zones.rename(columns={cf_col: 'capacity_factor'})
             top_zones['capacity_factor'] = (top_zones['capacity_factor'] * 100).round(1).astype(str) + '%'
         
         st.dataframe(top_zones, use_container_width=True)
         
         # Download results
         st.subheader("💾 Download Results")
-        csv_data = zones_gdf.to_csv(index=False)
+        csv_data = _zones_csv(frame_key, zones_gdf)
         st.download_button(
             label="Download Optimal Zones CSV",
             data=csv_data,
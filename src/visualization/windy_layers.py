@@ -6,6 +6,7 @@
 # ============================================================
 
 import requests
+import numpy as np
 import pandas as pd
 import folium
 from folium.plugins import HeatMap
@@ -49,18 +50,23 @@ def add_wind_layers(m, df):
     - Capacity Factor (proxy)
     - Seasonal Wind Speed
     """
+    lat = df["lat"].to_numpy()
+    lon = df["lon"].to_numpy()
+
     # Wind speed ANN
-    wind_data = [[row.lat, row.lon, row["WS100M"]["ANN"]] for _, row in df.iterrows()]
+    ws_ann = df[("WS100M", "ANN")].to_numpy()
+    wind_data = np.column_stack([lat, lon, ws_ann]).tolist()
     HeatMap(wind_data, name="🌬️ Wind Speed (100m)", radius=20).add_to(m)
 
     # Capacity factor proxy (WS^3 normalized)
-    df["CF"] = (df["WS100M"]["ANN"]**3 / df["WS100M"]["ANN"].max()**3).clip(0, 1)
-    cf_data = [[row.lat, row.lon, row.CF] for _, row in df.iterrows()]
+    cf = np.clip(ws_ann**3 / ws_ann.max()**3, 0, 1)
+    df["CF"] = cf
+    cf_data = np.column_stack([lat, lon, cf]).tolist()
     HeatMap(cf_data, name="⚡ Capacity Factor", radius=20).add_to(m)
 
     # Seasonal layers
     for season in ["DJF", "MAM", "JJA", "SON"]:
-        season_data = [[row.lat, row.lon, row["WS100M"][season]] for _, row in df.iterrows()]
+        season_data = np.column_stack([lat, lon, df[("WS100M", season)].to_numpy()]).tolist()
         HeatMap(season_data, name=f"📅 {season} Wind", radius=20).add_to(m)
 
     folium.LayerControl(collapsed=False).add_to(m)
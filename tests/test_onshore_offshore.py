@@ -0,0 +1,33 @@
+import geopandas as gpd
+from shapely.geometry import box
+
+from src.analysis import onshore_offshore
+
+
+def _use_land(monkeypatch, path):
+    monkeypatch.setattr(onshore_offshore, "LAND_POLYGON_PATH", str(path))
+    onshore_offshore._land.cache_clear()
+
+
+def test_classify_onshore_offshore_with_land_polygon(tmp_path, monkeypatch):
+    land_path = tmp_path / "land.geojson"
+    gpd.GeoDataFrame(geometry=[box(-9.0, 52.0, -7.0, 54.0)], crs="EPSG:4326").to_file(land_path)
+    _use_land(monkeypatch, land_path)
+    try:
+        labels = onshore_offshore.classify_onshore_offshore(
+            lats=[53.0, 53.0, 51.5], lons=[-8.0, -10.0, -8.0]
+        )
+        assert labels.tolist() == ["Onshore", "Offshore", "Offshore"]
+    finally:
+        onshore_offshore._land.cache_clear()
+
+
+def test_classify_onshore_offshore_without_land_polygon(tmp_path, monkeypatch):
+    _use_land(monkeypatch, tmp_path / "missing.geojson")
+    try:
+        assert onshore_offshore.classify_onshore_offshore([53.0], [-8.0]) is None
+        points = [{"latitude": 53.0, "longitude": -8.0}, {"latitude": 56.0, "longitude": -8.0}]
+        assert onshore_offshore.classify_grid_points(points) == ["Onshore", "Offshore"]
+    finally:
+        onshore_offshore._land.cache_clear()
+